@@ -34,5 +34,5 @@ echo "Starting AvatarTalk Expressive WebChat..."
 echo "Access the client at: http://localhost:8080"
 echo ""
 
-# Run with uv
+# Run with uv (uvicorn's default --loop/--http auto pick uvloop and httptools when installed)
 uv run uvicorn src.app:app --reload --port 8080 --host 0.0.0.0
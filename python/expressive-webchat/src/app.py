@@ -1,13 +1,15 @@
 import asyncio
 import json
 import logging
+import time
+from collections import deque
 from pathlib import Path
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .config import LANGUAGE_CHOICES, settings
 from .orchestrator import ConversationOrchestrator
@@ -19,6 +21,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("client_app")
 
+
+def _dumps(obj: object) -> bytes:
+    """Compact UTF-8 JSON, so frames can be pre-encoded and batched as bytes."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
 app = FastAPI(
     title="AvatarTalk Expressive WebChat", version="0.1.0", root_path=settings.ROOT_PATH
 )
@@ -32,12 +40,135 @@ templates_dir = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(templates_dir))
 
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Allow-all CORS policy as constant headers
+_CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"*"),
+    (b"access-control-allow-headers", b"*"),
+]
+_PREFLIGHT_HEADERS = [
+    *_CORS_HEADERS,
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"0"),
+]
+
+
+class StaticCORSMiddleware:
+    """Allow-all CORS without per-request origin matching.
+
+    Appends constant headers to HTTP responses and answers preflight requests
+    with a fixed 204. WebSocket scopes pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 204,
+                    "headers": _PREFLIGHT_HEADERS,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *_CORS_HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+app.add_middleware(StaticCORSMiddleware)
+
+
+class OutboundBatcher:
+    """Coalesce JSON control messages to the browser into fewer text frames.
+
+    Messages queued within ``max_delay_ms`` of each other are sent as a single
+    newline-delimited JSON frame of at most ``max_batch_bytes``. Binary video
+    frames bypass the batcher.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_batch_bytes: int = 16384,
+        max_delay_ms: float = 3.0,
+    ):
+        self.websocket = websocket
+        self.max_batch_bytes = max_batch_bytes
+        self.max_delay = max_delay_ms / 1000
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: dict) -> None:
+        """Queue a control message for the next flush."""
+        self._queue.put_nowait(_dumps(payload))
+
+    def send_encoded(self, frame: bytes) -> None:
+        """Queue an already JSON-encoded control message."""
+        self._queue.put_nowait(frame)
+
+    async def close(self) -> None:
+        """Flush anything still queued and stop the writer task."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        carry: bytes | None = None
+        while True:
+            if carry is None:
+                first = await self._queue.get()
+            else:
+                first, carry = carry, None
+            if first is None:
+                return
+
+            # Give concurrently produced messages a moment to join this frame
+            await asyncio.sleep(self.max_delay)
+
+            items = [first]
+            size = len(first)
+            stop = False
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                if size + len(item) > self.max_batch_bytes:
+                    carry = item
+                    break
+                items.append(item)
+                size += len(item)
+
+            # json.dumps escapes newlines inside strings, so they can delimit messages
+            frame = b"\n".join(items)
+            try:
+                await self.websocket.send_text(frame.decode())
+            except Exception as e:
+                logger.error("Error sending control messages to browser: %s", e)
+            if stop:
+                return
 
 
 @app.get("/")
@@ -51,26 +182,63 @@ async def root(request: Request):
     )
 
 
+# Static JSON bodies are fixed for the process lifetime, so encode them once
+_HEALTH_JSON = _dumps({"status": "healthy", "service": "expressive-webchat"})
+_LANGUAGES_JSON = _dumps(
+    {
+        "languages": [
+            {"code": code, "name": name} for code, name, _, _ in LANGUAGE_CHOICES
+        ],
+        "default": settings.DEFAULT_LANGUAGE,
+    }
+)
+_LANGUAGES_HEADERS = {"Cache-Control": "public, max-age=60"}
+
+# Status updates come from a small fixed set, so their frames are encoded once
+_STATUS_FRAMES = {
+    status: _dumps({"type": "status", "data": status})
+    for status in ("listening", "thinking", "speaking")
+}
+
+# Fixed error frames, encoded once so failure paths allocate nothing extra
+_ERR_INIT_TIMEOUT = _dumps({"type": "error", "data": "Initialization timeout"})
+_ERR_EXPECTED_INIT = _dumps({"type": "error", "data": "Expected init message"})
+_ERR_INVALID_INIT = _dumps({"type": "error", "data": "Invalid init message"})
+_ERR_START_FAILED = _dumps({"type": "error", "data": "Failed to start session"})
+_ERR_INTERNAL = _dumps({"type": "error", "data": "Internal server error"})
+
+# Init defaults, bound once instead of read from settings on every connection
+_DEFAULT_AVATAR = settings.DEFAULT_AVATAR
+_DEFAULT_EXPRESSION = settings.DEFAULT_EXPRESSION
+_DEFAULT_PROMPT = settings.SYSTEM_PROMPT
+_INIT_TIMEOUT = settings.INIT_MESSAGE_TIMEOUT
+
+# buffer_status reports closer together than this are forwarded upstream only
+# when the buffer level moved by more than _BUFFER_STATUS_MIN_DELTA_MS
+_BUFFER_STATUS_MIN_INTERVAL = 0.1
+_BUFFER_STATUS_MIN_DELTA_MS = 50.0
+
+# Orchestrators released by closed connections, reused by new ones so their
+# AvatarTalk/Deepgram client objects are not rebuilt on every page load
+_MAX_IDLE_ORCHESTRATORS = 8
+_idle_orchestrators: deque[ConversationOrchestrator] = deque(
+    maxlen=_MAX_IDLE_ORCHESTRATORS
+)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "service": "expressive-webchat",
-        }
-    )
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
 @app.get("/api/languages")
 async def get_languages():
     """Return available languages for speech recognition."""
-    languages = [{"code": code, "name": name} for code, name, _, _ in LANGUAGE_CHOICES]
-    return JSONResponse(
-        content={
-            "languages": languages,
-            "default": settings.DEFAULT_LANGUAGE,
-        }
+    return Response(
+        content=_LANGUAGES_JSON,
+        media_type="application/json",
+        headers=_LANGUAGES_HEADERS,
     )
 
 
@@ -86,35 +254,38 @@ async def conversation_endpoint(websocket: WebSocket):
     """
     await websocket.accept()
 
-    orchestrator = ConversationOrchestrator()
+    if _idle_orchestrators:
+        orchestrator = _idle_orchestrators.pop()
+    else:
+        orchestrator = ConversationOrchestrator()
+    batcher = OutboundBatcher(websocket)
+    batcher.start()
 
     async def send_status(status: str):
         """Send status update to browser (JSON text frame)."""
-        try:
-            await websocket.send_json({"type": "status", "data": status})
-        except Exception as e:
-            logger.error(f"Error sending status to browser: {e}")
+        frame = _STATUS_FRAMES.get(status)
+        if frame is not None:
+            batcher.send_encoded(frame)
+        else:
+            batcher.send({"type": "status", "data": status})
 
     async def send_session_ready(session_id: str):
         """Send session ready notification to browser (JSON text frame)."""
-        try:
-            await websocket.send_json(
-                {
-                    "type": "session_ready",
-                    "data": {
-                        "session_id": session_id,
-                    },
-                }
-            )
-        except Exception as e:
-            logger.error(f"Error sending session_ready to browser: {e}")
+        batcher.send(
+            {
+                "type": "session_ready",
+                "data": {
+                    "session_id": session_id,
+                },
+            }
+        )
 
     async def send_video_data(video_bytes: bytes):
         """Forward video data to browser (binary frame)."""
         try:
             await websocket.send_bytes(video_bytes)
         except Exception as e:
-            logger.error(f"Error sending video data to browser: {e}")
+            logger.error("Error sending video data to browser: %s", e)
 
     orchestrator.on_status_change = send_status
     orchestrator.on_session_ready = send_session_ready
@@ -123,34 +294,39 @@ async def conversation_endpoint(websocket: WebSocket):
     try:
         # Wait for init message with timeout
         try:
-            data = await asyncio.wait_for(
-                websocket.receive_json(),
-                timeout=settings.INIT_MESSAGE_TIMEOUT,
+            init_text = await asyncio.wait_for(
+                websocket.receive_text(),
+                timeout=_INIT_TIMEOUT,
             )
         except asyncio.TimeoutError:
-            logger.warning(
-                f"Init message timeout after {settings.INIT_MESSAGE_TIMEOUT}s"
-            )
-            await websocket.send_json(
-                {"type": "error", "data": "Initialization timeout"}
-            )
+            logger.warning("Init message timeout after %ss", _INIT_TIMEOUT)
+            batcher.send_encoded(_ERR_INIT_TIMEOUT)
             return
 
+        data = json.loads(init_text)
         if data.get("type") != "init":
-            logger.warning(f"Expected init message, got: {data.get('type')}")
-            await websocket.send_json(
-                {"type": "error", "data": "Expected init message"}
-            )
+            logger.warning("Expected init message, got: %s", data.get("type"))
+            batcher.send_encoded(_ERR_EXPECTED_INIT)
             return
 
         payload = data.get("data", {})
 
-        avatar = str(payload.get("avatar", settings.DEFAULT_AVATAR))
-        expression = str(payload.get("expression", settings.DEFAULT_EXPRESSION))
-        prompt = str(payload.get("prompt", settings.SYSTEM_PROMPT))
-        language = str(payload.get("language", "en"))
+        avatar = payload.get("avatar", _DEFAULT_AVATAR)
+        expression = payload.get("expression", _DEFAULT_EXPRESSION)
+        prompt = payload.get("prompt", _DEFAULT_PROMPT)
+        language = payload.get("language", "en")
         use_pregen = bool(payload.get("use_pregen", True))
 
+        if not (
+            isinstance(avatar, str)
+            and isinstance(expression, str)
+            and isinstance(prompt, str)
+            and isinstance(language, str)
+        ):
+            logger.warning("Invalid init message: expected string fields")
+            batcher.send_encoded(_ERR_INVALID_INIT)
+            return
+
         try:
             await orchestrator.start_session(
                 avatar=avatar,
@@ -160,32 +336,36 @@ async def conversation_endpoint(websocket: WebSocket):
                 use_pregen=use_pregen,
             )
         except ConnectionError as e:
-            logger.error(f"Failed to start session: {e}")
-            await websocket.send_json(
-                {"type": "error", "data": f"Connection failed: {e}"}
-            )
+            logger.error("Failed to start session: %s", e)
+            batcher.send({"type": "error", "data": f"Connection failed: {e}"})
             return
         except Exception as e:
-            logger.error(f"Unexpected error starting session: {e}")
-            await websocket.send_json(
-                {"type": "error", "data": "Failed to start session"}
-            )
+            logger.error("Unexpected error starting session: %s", e)
+            batcher.send_encoded(_ERR_START_FAILED)
             return
 
         # Session ready notification will be sent via callback when AvatarTalk responds
 
-        # Audio + control streaming loop
+        # Audio + control streaming loop. Audio arrives every ~20ms, so work
+        # directly on the raw ASGI messages and keep the audio branch first.
+        receive = websocket.receive
+        process_audio = orchestrator.process_audio
+        last_buffer_send_ts = 0.0
+        last_buffered_ms = 0.0
         while True:
-            message = await websocket.receive()
-            data_bytes = message.get("bytes")
-            data_text = message.get("text")
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
 
             # Binary audio frames
+            data_bytes = message.get("bytes")
             if data_bytes is not None:
-                await orchestrator.process_audio(data_bytes)
+                await process_audio(data_bytes)
+                continue
 
             # Text control messages (e.g., audio_config)
-            elif data_text:
+            data_text = message.get("text")
+            if data_text:
                 try:
                     control_msg = json.loads(data_text)
                 except json.JSONDecodeError:
@@ -198,30 +378,44 @@ async def conversation_endpoint(websocket: WebSocket):
                     sr = data_payload.get("sample_rate")
                     ch = data_payload.get("channel_count")
                     logger.info(
-                        f"Received audio_config from browser: sample_rate={sr}, channels={ch}"
+                        "Received audio_config from browser: sample_rate=%s, channels=%s",
+                        sr,
+                        ch,
                     )
                     orchestrator.set_audio_config(sample_rate=sr, channel_count=ch)
                 elif msg_type == "buffer_status":
                     buffered_ms = data_payload.get("buffered_ms")
                     playback_position = data_payload.get("playback_position")
                     if buffered_ms is not None:
+                        buffered_ms = float(buffered_ms)
+                        now = time.monotonic()
+                        if (
+                            now - last_buffer_send_ts < _BUFFER_STATUS_MIN_INTERVAL
+                            and abs(buffered_ms - last_buffered_ms)
+                            <= _BUFFER_STATUS_MIN_DELTA_MS
+                        ):
+                            continue
+                        last_buffer_send_ts = now
+                        last_buffered_ms = buffered_ms
                         await orchestrator.send_buffer_status(
-                            float(buffered_ms), float(playback_position or 0.0)
+                            buffered_ms, float(playback_position or 0.0)
                         )
                 # Additional control messages can be handled here as needed
 
     except WebSocketDisconnect:
         logger.info("Client disconnected")
     except Exception as e:
-        logger.error(f"Error in conversation: {e}", exc_info=True)
-        try:
-            await websocket.send_json(
-                {"type": "error", "data": "Internal server error"}
-            )
-        except Exception:
-            pass  # Client may have disconnected
+        logger.error("Error in conversation: %s", e, exc_info=True)
+        batcher.send_encoded(_ERR_INTERNAL)
     finally:
         try:
-            await orchestrator.stop_session()
-        except Exception as e:
-            logger.error(f"Error stopping session: {e}")
+            try:
+                await orchestrator.stop_session()
+            except Exception as e:
+                logger.error("Error stopping session: %s", e)
+            else:
+                # Only a cleanly stopped orchestrator goes back to the pool
+                orchestrator.reset()
+                _idle_orchestrators.append(orchestrator)
+        finally:
+            await batcher.close()
@@ -1,11 +1,13 @@
 import asyncio
 import json
 import logging
+import math
 from typing import Awaitable, Callable, Optional
 from urllib.parse import urlencode
 
 import websockets
-from websockets.exceptions import ConnectionClosed, WebSocketException
+from websockets.asyncio.client import ClientConnection
+from websockets.exceptions import ConnectionClosed, ConnectionClosedOK, WebSocketException
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +15,42 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONNECT_TIMEOUT = 30.0
 DEFAULT_CLOSE_TIMEOUT = 5.0
 
+# Transport write buffer (high, low) water marks. Large enough that the kernel,
+# not a Python-level drain, paces writes.
+DEFAULT_WRITE_LIMIT = (1024 * 1024, 256 * 1024)
+
+# Video chunks buffered between the AvatarTalk reader and the browser writer
+DEFAULT_VIDEO_QUEUE_SIZE = 16
+
+# Pre-encoded control frames with a fixed shape
+_TEXT_STREAM_DONE = b'{"type":"text_stream_done","data":{}}'
+_TURN_START = b'{"type":"turn_start","data":{}}'
+_BUFFER_STATUS_TEMPLATE = b'{"type":"buffer_status","data":{"buffered_ms":%a,"playback_position":%a}}'
+
+# Acknowledgment message types that need no action beyond debug logging
+_ACK_TYPES = frozenset({"text_queued", "text_appended", "text_stream_completed", "turn_queued", "pong"})
+
 
 class AvatarTalkClient:
     """Client for AvatarTalk WebSocket streaming.
 
     Uses a single WebSocket connection for both control messages (JSON text frames)
-    and video streaming (binary frames).
+    and video streaming (binary frames). Video is forwarded to ``on_video_data``
+    fragment by fragment, so a single MP4 segment may arrive in several chunks.
 
     Authentication: Bearer token via `Authorization: Bearer <AVATARTALK_API_KEY>` header.
     """
 
-    def __init__(self, url: str, api_key: str = "", connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+    def __init__(
+        self,
+        url: str,
+        api_key: str = "",
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    ):
         self.url = url.rstrip("/")
         self.api_key = api_key
         self.connect_timeout = connect_timeout
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.ws: Optional[ClientConnection] = None
         self.session_id: Optional[str] = None
         self._connected = False
         self._closing = False
@@ -48,6 +71,8 @@ class AvatarTalkClient:
         self.on_video_data: Optional[Callable[[bytes], Awaitable[None]]] = None
 
         self._listen_task: Optional[asyncio.Task] = None
+        self._video_queue: Optional[asyncio.Queue] = None
+        self._video_task: Optional[asyncio.Task] = None
 
     async def connect(
         self,
@@ -78,9 +103,9 @@ class AvatarTalkClient:
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-            logger.info(f"Connecting to AvatarTalk API: {uri} (auth: Bearer token)")
+            logger.info("Connecting to AvatarTalk API: %s (auth: Bearer token)", uri)
         else:
-            logger.warning(f"Connecting to AvatarTalk API without authentication: {uri}")
+            logger.warning("Connecting to AvatarTalk API without authentication: %s", uri)
 
         try:
             self.ws = await asyncio.wait_for(
@@ -90,17 +115,23 @@ class AvatarTalkClient:
                     ping_interval=20,  # Send ping every 20s to keep connection alive
                     ping_timeout=10,  # Wait 10s for pong response
                     close_timeout=DEFAULT_CLOSE_TIMEOUT,
+                    max_size=None,  # MP4 segments can exceed the 1 MiB default
+                    write_limit=DEFAULT_WRITE_LIMIT,
+                    # MP4 is already compressed, and control frames are too small to benefit
+                    compression=None,
                 ),
                 timeout=self.connect_timeout,
             )
             self._connected = True
             self._closing = False
+            self._video_queue = asyncio.Queue(maxsize=DEFAULT_VIDEO_QUEUE_SIZE)
+            self._video_task = asyncio.create_task(self._video_forward_loop(self._video_queue))
             self._listen_task = asyncio.create_task(self._listen_loop())
         except asyncio.TimeoutError:
-            logger.error(f"Connection to AvatarTalk timed out after {self.connect_timeout}s")
+            logger.error("Connection to AvatarTalk timed out after %ss", self.connect_timeout)
             raise ConnectionError(f"Connection timeout after {self.connect_timeout}s")
         except WebSocketException as e:
-            logger.error(f"WebSocket connection failed: {e}")
+            logger.error("WebSocket connection failed: %s", e)
             raise ConnectionError(f"WebSocket connection failed: {e}")
 
     def _check_connected(self) -> None:
@@ -142,7 +173,7 @@ class AvatarTalkClient:
         }
 
         msg = {"type": "session_start", "data": data}
-        logger.info(f"Sending session_start: avatar={avatar}, expression={expression}")
+        logger.info("Sending session_start: avatar=%s, expression=%s", avatar, expression)
         await self.ws.send(json.dumps(msg))
 
     async def send_text(
@@ -177,11 +208,11 @@ class AvatarTalkClient:
         """
         self._check_connected()
 
-        data: dict = {}
-        if expression is not None:
-            data["expression"] = expression
+        if expression is None:
+            await self.ws.send(_TURN_START, text=True)
+            return
 
-        msg = {"type": "turn_start", "data": data}
+        msg = {"type": "turn_start", "data": {"expression": expression}}
         await self.ws.send(json.dumps(msg))
 
     async def append_text(self, text: str):
@@ -205,13 +236,19 @@ class AvatarTalkClient:
         """
         self._check_connected()
 
-        msg = {"type": "text_stream_done", "data": {}}
-        await self.ws.send(json.dumps(msg))
+        await self.ws.send(_TEXT_STREAM_DONE, text=True)
 
     async def send_buffer_status(self, buffered_ms: float, playback_position: float):
         """Send client-side video buffer status for adaptive streaming."""
         self._check_connected()
 
+        buffered_ms = float(buffered_ms)
+        playback_position = float(playback_position)
+        if math.isfinite(buffered_ms) and math.isfinite(playback_position):
+            # Float reprs are valid JSON numbers, so skip the dict -> JSON walk
+            await self.ws.send(_BUFFER_STATUS_TEMPLATE % (buffered_ms, playback_position), text=True)
+            return
+
         msg = {
             "type": "buffer_status",
             "data": {
@@ -227,70 +264,100 @@ class AvatarTalkClient:
         Handles both:
         - Text frames: JSON control messages
         - Binary frames: MP4 video data
+
+        Messages are read with ``recv_streaming()`` so that fragments of large
+        MP4 segments are forwarded as they arrive instead of being reassembled
+        into a single ``bytes`` object first. Text messages are joined before
+        parsing since JSON needs the whole message.
         """
         try:
-            async for message in self.ws:
-                if isinstance(message, bytes):
-                    # Binary frame - video data
-                    if self.on_video_data:
-                        await self.on_video_data(message)
-                else:
+            while True:
+                text_parts: list[str] = []
+                try:
+                    async for fragment in self.ws.recv_streaming():
+                        if isinstance(fragment, str):
+                            text_parts.append(fragment)
+                        elif fragment and self.on_video_data:
+                            # Binary fragment - video data. Queued so the next read
+                            # overlaps with the browser write; blocks when full.
+                            await self._video_queue.put(fragment)
+                except ConnectionClosedOK:
+                    # Normal closure ends the loop without an error
+                    break
+
+                if text_parts:
                     # Text frame - JSON control message
-                    data = json.loads(message)
-                    msg_type = data.get("type")
-                    msg_data = data.get("data", {})
-
-                    if msg_type == "session_ready":
-                        self.session_id = msg_data.get("session_id")
-                        logger.info(f"AvatarTalk Session Ready: {self.session_id}")
-                        if self.on_session_ready and self.session_id is not None:
-                            await self.on_session_ready(self.session_id)
-
-                    elif msg_type == "state_change":
-                        from_state = msg_data.get("from")
-                        to_state = msg_data.get("to")
-                        if self.on_state_change:
-                            await self.on_state_change(from_state, to_state)
-
-                    elif msg_type == "ready_to_listen":
-                        if self.on_ready_to_listen:
-                            await self.on_ready_to_listen()
-
-                    elif msg_type == "error":
-                        error_msg = msg_data.get("message", "Unknown error")
-                        logger.error(f"AvatarTalk error: {error_msg}")
-                        if self.on_error:
-                            await self.on_error(error_msg)
-
-                    elif msg_type in (
-                        "text_queued",
-                        "text_appended",
-                        "text_stream_completed",
-                        "turn_queued",
-                        "pong",
-                    ):
-                        # Acknowledgments - log but no action needed
-                        logger.debug(f"Received {msg_type}: {msg_data}")
-
-                    else:
-                        logger.debug(f"Unhandled message type: {msg_type}")
+                    await self._handle_control_message("".join(text_parts))
 
         except ConnectionClosed as e:
             if not self._closing:
-                logger.warning(f"AvatarTalk connection closed unexpectedly: {e}")
+                logger.warning("AvatarTalk connection closed unexpectedly: %s", e)
             else:
-                logger.info(f"AvatarTalk connection closed: {e}")
+                logger.info("AvatarTalk connection closed: %s", e)
         except asyncio.CancelledError:
             logger.debug("AvatarTalk listen loop cancelled")
         except Exception as e:
-            logger.error(f"AvatarTalk connection error: {e}", exc_info=True)
+            logger.error("AvatarTalk connection error: %s", e, exc_info=True)
         finally:
             self._connected = False
             if self.on_disconnect and not self._closing:
                 try:
                     await self.on_disconnect()
                 except Exception as e:
-                    logger.error(f"Error in disconnect callback: {e}")
+                    logger.error("Error in disconnect callback: %s", e)
+
+    async def _video_forward_loop(self, queue: asyncio.Queue):
+        """Forward queued video chunks to on_video_data in arrival order."""
+        while True:
+            chunk = await queue.get()
+            try:
+                await self.on_video_data(chunk)
+            except Exception as e:
+                logger.error("Error forwarding video data: %s", e)
+
+    async def _handle_control_message(self, message: str):
+        """Dispatch a JSON control message received from AvatarTalk."""
+        data = json.loads(message)
+        msg_type = data.get("type")
+        msg_data = data.get("data", {})
+
+        handler = self._CONTROL_HANDLERS.get(msg_type)
+        if handler is not None:
+            await handler(self, msg_data)
+        elif msg_type in _ACK_TYPES:
+            # Acknowledgments - log but no action needed
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received %s: %s", msg_type, msg_data)
+        else:
+            logger.debug("Unhandled message type: %s", msg_type)
+
+    async def _on_session_ready_message(self, msg_data: dict):
+        self.session_id = msg_data.get("session_id")
+        logger.info("AvatarTalk Session Ready: %s", self.session_id)
+        if self.on_session_ready and self.session_id is not None:
+            await self.on_session_ready(self.session_id)
+
+    async def _on_state_change_message(self, msg_data: dict):
+        if self.on_state_change:
+            await self.on_state_change(msg_data.get("from"), msg_data.get("to"))
+
+    async def _on_ready_to_listen_message(self, msg_data: dict):
+        if self.on_ready_to_listen:
+            await self.on_ready_to_listen()
+
+    async def _on_error_message(self, msg_data: dict):
+        error_msg = msg_data.get("message", "Unknown error")
+        logger.error("AvatarTalk error: %s", error_msg)
+        if self.on_error:
+            await self.on_error(error_msg)
+
+    # Control message type -> handler, looked up once per inbound text frame
+    _CONTROL_HANDLERS = {
+        "session_ready": _on_session_ready_message,
+        "state_change": _on_state_change_message,
+        "ready_to_listen": _on_ready_to_listen_message,
+        "error": _on_error_message,
+    }
 
     async def disconnect(self):
         """Gracefully disconnect from the AvatarTalk API."""
@@ -307,13 +374,22 @@ class AvatarTalkClient:
                 pass
             self._listen_task = None
 
+        if self._video_task:
+            self._video_task.cancel()
+            try:
+                await self._video_task
+            except asyncio.CancelledError:
+                pass
+            self._video_task = None
+        self._video_queue = None
+
         if self.ws:
             try:
                 await asyncio.wait_for(self.ws.close(), timeout=DEFAULT_CLOSE_TIMEOUT)
             except asyncio.TimeoutError:
                 logger.warning("Timeout closing WebSocket, forcing close")
             except Exception as e:
-                logger.warning(f"Error closing WebSocket: {e}")
+                logger.warning("Error closing WebSocket: %s", e)
             self.ws = None
 
         self.session_id = None
@@ -91,13 +91,13 @@ LANGUAGE_CHOICES: list[tuple[str, str, ASRModel, str]] = [
     ("hi", "Hindi", ASRModel.NOVA3, "hi"),
 ]
 
+# Index of LANGUAGE_CHOICES by language code for O(1) lookups
+_LANG_BY_CODE: dict[str, tuple[str, str, ASRModel, str]] = {lang[0]: lang for lang in LANGUAGE_CHOICES}
+
 
 def get_language_config(code: str) -> tuple[str, str, ASRModel, str] | None:
     """Get language configuration by code."""
-    for lang in LANGUAGE_CHOICES:
-        if lang[0] == code:
-            return lang
-    return None
+    return _LANG_BY_CODE.get(code)
 
 
 def get_asr_model_for_language(code: str) -> ASRModel:
@@ -144,6 +144,7 @@ class ClientConfig(BaseSettings):
 
     # LLM
     LLM_MODEL: str = "gpt-4o-mini"
+    LLM_SUMMARY_MODEL: str = ""  # Set to summarize old history (extra LLM call); empty drops it
     SYSTEM_PROMPT: str = "You are a helpful and friendly AI avatar."
 
     # Timeouts (seconds)
@@ -157,6 +158,9 @@ class ClientConfig(BaseSettings):
     # Limits
     MAX_PROMPT_LENGTH: int = 4000  # Max system prompt length
 
+    # Performance
+    DEEPGRAM_RAW_AUDIO_SEND: bool = False  # Write audio straight to the SDK's websocket
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     @model_validator(mode="after")
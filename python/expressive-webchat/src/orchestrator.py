@@ -1,7 +1,8 @@
 import asyncio
 import json
 import logging
-import re
+from collections import deque
+from operator import attrgetter
 from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from deepgram import AsyncDeepgramClient
@@ -23,8 +24,95 @@ from .config import (
 
 logger = logging.getLogger(__name__)
 
+# Max queued audio chunks coalesced into one Deepgram frame. Only audio that is
+# already waiting gets merged, so this never delays a chunk.
+_MAX_AUDIO_BATCH = 8
+
+# Caps on buffered transcript text per turn; the oldest pieces are dropped first
+_MAX_TRANSCRIPT_CHARS = 8192
+_MAX_TRANSCRIPT_PARTS = 256
+
+# Opening history messages (the first exchange) that are never trimmed
+_HISTORY_ANCHOR_MESSAGES = 2
+
+# Instructions for condensing older history into a single message
+_SUMMARY_PROMPT = (
+    "Summarize the following conversation between a user and an AI avatar in a few sentences. "
+    "Keep names, facts, preferences and open questions the avatar may need later."
+)
+
+# Background task count above which a backlog warning is logged
+_PENDING_TASKS_WARN = 64
+
+# Turn gate bits, set together on EOT and cleared on ready_to_listen
+_GATE_IGNORE_TX = 1  # Ignore transcripts during avatar's turn
+_GATE_PAUSE_AUDIO = 2  # Stop sending audio to Deepgram
+_GATE_AVATAR_TURN = _GATE_IGNORE_TX | _GATE_PAUSE_AUDIO
+
+# Nova (listen.v1) control messages; send_control only serializes them
+_KEEPALIVE_MSG = ListenV1ControlMessage(type="KeepAlive")
+_FINALIZE_MSG = ListenV1ControlMessage(type="Finalize")
+
+# Attribute getters for the Deepgram message fields read on every event
+_get_type = attrgetter("type")
+_get_turn_info = attrgetter("event", "transcript")
+_get_result_flags = attrgetter("is_final", "speech_final")
+
+# Parses the JSON expression prefix emitted by the LLM, e.g. {"expression": "happy"}
+_EXPRESSION_DECODER = json.JSONDecoder()
+
+# Shared by all orchestrators so sessions reuse one HTTP client and its pools
+_deepgram_client: Optional[AsyncDeepgramClient] = None
+
+
+def _get_deepgram() -> AsyncDeepgramClient:
+    """Return the process-wide Deepgram client, creating it on first use."""
+    global _deepgram_client
+    if _deepgram_client is None:
+        _deepgram_client = AsyncDeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
+    return _deepgram_client
+
 
 class ConversationOrchestrator:
+    # Every attribute is assigned in __init__ or reset(); keep this list in sync.
+    __slots__ = (
+        "avatartalk",
+        "deepgram",
+        "_dg_connect_lock",
+        "dg_connection",
+        "transcript_buffer",
+        "_transcript_chars",
+        "dg_listen_task",
+        "_dg_audio_deque",
+        "_dg_audio_event",
+        "_dg_worker_task",
+        "_keepalive_handle",
+        "_pending_tasks",
+        "language",
+        "asr_model",
+        "deepgram_language",
+        "system_prompt",
+        "_system_message",
+        "is_listening",
+        "is_avatar_speaking",
+        "session_active",
+        "avatar_turn_active",
+        "_gate_flags",
+        "audio_sample_rate",
+        "audio_channels",
+        "audio_configured",
+        "use_pregen",
+        "expressive_mode",
+        "current_expression",
+        "conversation_history",
+        "max_history_messages",
+        "_cache_anchor_len",
+        "_summary_task",
+        "on_status_change",
+        "on_session_ready",
+        "on_video_data",
+    )
+
     def __init__(self):
         """Initialize the orchestrator."""
         self.avatartalk = AvatarTalkClient(
@@ -34,30 +122,44 @@ class ConversationOrchestrator:
         )
         logger.info(f"Orchestrator initialized: url={settings.AVATARTALK_API_BASE}")
 
-        # Deepgram setup (SDK 5.3.0)
-        self.deepgram = AsyncDeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
+        # Deepgram setup (SDK 5.3.0). The client is shared; only the per-session
+        # listen connections are opened and closed here.
+        self.deepgram = _get_deepgram()
+        self._dg_connect_lock = asyncio.Lock()
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all session-local state.
+
+        The AvatarTalk and Deepgram clients are kept, so an orchestrator can be
+        reused for a new connection once stop_session() has completed.
+        """
         self.dg_connection = None
-        self.transcript_buffer = []  # Buffer for turn detection
+        self.transcript_buffer: deque[str] = deque(maxlen=_MAX_TRANSCRIPT_PARTS)  # Buffer for turn detection
+        self._transcript_chars = 0  # Running size of transcript_buffer
         self.dg_listen_task = None
-        self._dg_connect_lock = asyncio.Lock()
 
         # Internal Deepgram streaming state
-        self._dg_audio_queue: Optional[asyncio.Queue] = None
+        self._dg_audio_deque: Optional[deque] = None  # Single producer/consumer audio pipe
+        self._dg_audio_event: Optional[asyncio.Event] = None  # Set when audio is queued
         self._dg_worker_task: Optional[asyncio.Task] = None
+        self._keepalive_handle: Optional[asyncio.TimerHandle] = None  # Nova KeepAlive timer
         self._pending_tasks: set[asyncio.Task] = set()  # Track background tasks
 
         # Language and ASR model configuration
         self.language: str = "en"
         self.asr_model: ASRModel = ASRModel.FLUX
         self.deepgram_language: str = "en"
+        self.system_prompt: str = ""
+        self._system_message: Optional[dict] = None  # Built on first turn, see _build_system_message
 
         # State
         self.is_listening = False
         self.is_avatar_speaking = False
         self.session_active = False
         self.avatar_turn_active = False  # True from EOT until dynamic speech completes
-        self._ignore_transcripts = False  # Ignore transcripts during avatar's turn
-        self._pause_audio_sending = False  # Gate to stop sending audio to Deepgram
+        self._gate_flags = 0  # _GATE_* bits; non-zero during avatar's turn
         self.audio_sample_rate = 16000
         self.audio_channels = 1
         self.audio_configured = False
@@ -69,6 +171,9 @@ class ConversationOrchestrator:
 
         self.conversation_history: list[dict] = []
         self.max_history_messages = 30
+        # Leading history messages kept across trims so the prompt prefix stays stable
+        self._cache_anchor_len = _HISTORY_ANCHOR_MESSAGES
+        self._summary_task: Optional[asyncio.Task] = None  # In-flight history summarization
 
         # Callbacks
         self.on_status_change: Optional[Callable[[str], Awaitable[None]]] = None
@@ -85,6 +190,7 @@ class ConversationOrchestrator:
         prompt: str,
         language: str = "en",
         use_pregen: bool = True,
+        sample_rate: int | None = None,
     ):
         """Start the conversation session.
 
@@ -94,6 +200,8 @@ class ConversationOrchestrator:
             prompt: System prompt for LLM
             language: Language code, defaults to "en"
             use_pregen: Whether to use pregenerated videos for transitions
+            sample_rate: Browser audio sample rate, if already known. When given,
+                the Deepgram connection is opened alongside the AvatarTalk session.
         """
         # Validate and sanitize prompt length
         if len(prompt) > settings.MAX_PROMPT_LENGTH:
@@ -106,6 +214,7 @@ class ConversationOrchestrator:
         self.language = language
         self.asr_model = get_asr_model_for_language(language)
         self.deepgram_language = get_deepgram_language_code(language)
+        self._system_message = None
         logger.info(
             f"Language configured: {language} -> ASR model: {self.asr_model.value}, Deepgram lang: {self.deepgram_language}"
         )
@@ -133,15 +242,26 @@ class ConversationOrchestrator:
         self.avatartalk.on_session_ready = self._handle_avatartalk_session_ready
         self.avatartalk.on_video_data = self._handle_video_data
 
-        # Start AvatarTalk session
-        await self.avatartalk.start_session(
+        # Start AvatarTalk session. If the audio format is already known, open
+        # the Deepgram connection concurrently so the first turn doesn't pay
+        # for the handshake.
+        start = self.avatartalk.start_session(
             avatar=avatar,
             expression=effective_expression,
             language=language,
             expressive_mode=self.expressive_mode,
         )
-
-        self.session_active = True
+        if sample_rate:
+            self.set_audio_config(sample_rate=sample_rate)
+            self.session_active = True
+            try:
+                await asyncio.gather(start, self.warm_up())
+            except BaseException:
+                self.session_active = False
+                raise
+        else:
+            await start
+            self.session_active = True
 
     async def stop_session(self):
         """Stop the conversation session and cleanup resources."""
@@ -150,11 +270,9 @@ class ConversationOrchestrator:
 
         # Stop Deepgram connection
         # Signal the worker (if any) that no more audio will be sent.
-        if self._dg_audio_queue is not None:
-            try:
-                await self._dg_audio_queue.put(None)
-            except Exception as e:
-                logger.error(f"Error signaling Deepgram worker to stop: {e}")
+        if self._dg_audio_deque is not None:
+            self._dg_audio_deque.append(None)
+            self._dg_audio_event.set()
 
         # Cancel worker and listener tasks if they are still running.
         if self._dg_worker_task:
@@ -174,16 +292,16 @@ class ConversationOrchestrator:
             self.dg_listen_task = None
 
         self.dg_connection = None
-        self._dg_audio_queue = None
+        self._dg_audio_deque = None
+        self._dg_audio_event = None
 
-        # Cancel any pending background tasks
-        for task in list(self._pending_tasks):
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        self._pending_tasks.clear()
+        # Cancel any pending background tasks and wait for them together
+        if self._pending_tasks:
+            pending = list(self._pending_tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._pending_tasks.clear()
 
         # Disconnect from AvatarTalk
         await self.avatartalk.disconnect()
@@ -193,6 +311,11 @@ class ConversationOrchestrator:
         if not self.session_active or not self.is_listening:
             return
 
+        # Audio gate closed (turn switched): drop here instead of queueing audio
+        # the worker would only discard.
+        if self._gate_flags & _GATE_PAUSE_AUDIO:
+            return
+
         # Ensure we've received audio configuration from the browser before
         # attempting to connect to Deepgram. This guarantees that
         # self.audio_sample_rate matches the actual stream.
@@ -200,23 +323,24 @@ class ConversationOrchestrator:
             logger.warning("Dropping audio frame because audio_config has not been received yet")
             return
 
-        # Lazily establish Deepgram connection + worker on first audio frame,
-        # using the configured sample rate.
-        try:
-            await self._ensure_deepgram_connection()
-        except Exception as e:
-            logger.error(f"Unable to establish Deepgram connection while processing audio: {e}")
-            return
+        # The connection is normally pre-warmed once audio_config arrives; this
+        # covers the case where it was never opened or has since been closed.
+        # Check the worker inline so the common case skips the extra await.
+        worker = self._dg_worker_task
+        if worker is None or worker.done():
+            try:
+                await self._ensure_deepgram_connection()
+            except Exception as e:
+                logger.error(f"Unable to establish Deepgram connection while processing audio: {e}")
+                return
 
-        if not self._dg_audio_queue:
+        if self._dg_audio_deque is None:
             logger.error("Deepgram audio queue is not available; dropping audio chunk")
             return
 
-        try:
-            logger.debug(f"Queueing audio chunk for Deepgram: {len(audio_data)} bytes at {self.audio_sample_rate} Hz")
-            await self._dg_audio_queue.put(audio_data)
-        except Exception as e:
-            logger.error(f"Error queueing audio for Deepgram: {e}")
+        logger.debug("Queueing audio chunk for Deepgram: %d bytes at %d Hz", len(audio_data), self.audio_sample_rate)
+        self._dg_audio_deque.append(audio_data)
+        self._dg_audio_event.set()
 
     async def send_buffer_status(self, buffered_ms: float, playback_position: Optional[float] = None):
         """Forward browser video buffer status to AvatarTalk for adaptive streaming."""
@@ -237,6 +361,19 @@ class ConversationOrchestrator:
         self.audio_configured = True
         logger.info(f"Applied audio_config: sample_rate={self.audio_sample_rate}, channels={self.audio_channels}")
 
+        # Open the Deepgram connection now rather than on the first audio frame
+        if self.session_active:
+            self._create_tracked_task(self.warm_up())
+
+    async def warm_up(self):
+        """Establish the Deepgram connection ahead of the first audio frame."""
+        if not self.audio_configured:
+            return
+        try:
+            await self._ensure_deepgram_connection()
+        except Exception as e:
+            logger.error(f"Unable to pre-warm Deepgram connection: {e}")
+
     async def _connect_deepgram_flux(self):
         """
         Deepgram Flux worker: opens a Flux listen.v2 connection and streams audio
@@ -259,74 +396,11 @@ class ConversationOrchestrator:
             ) as connection:
                 self.dg_connection = connection
 
-                # Define message handler for Flux listen.v2 streaming.
-                def on_message(message) -> None:
-                    msg_type = getattr(message, "type", None)
-
-                    # Connected event (initial handshake/configuration)
-                    if msg_type == "Connected":
-                        logger.info("Deepgram Flux connected event received")
-                        return
-
-                    # Fatal error event
-                    if msg_type == "FatalError":
-                        error_message = getattr(message, "message", None)
-                        logger.error(f"Deepgram Flux fatal error: {error_message or message}")
-                        # Stop listening on fatal error; the worker loop will exit
-                        self.is_listening = False
-                        return
-
-                    # TurnInfo events carry transcript updates and EndOfTurn signals
-                    if msg_type == "TurnInfo":
-                        # Ignore transcripts during avatar's turn
-                        if self._ignore_transcripts:
-                            logger.debug(f"Ignoring Flux TurnInfo during avatar turn")
-                            return
-
-                        event = getattr(message, "event", None)
-                        transcript_text = getattr(message, "transcript", "") or ""
-
-                        if transcript_text:
-                            logger.debug(f"Flux TurnInfo ({event}): {transcript_text}")
-                            # Accumulate transcript text for this turn
-                            self.transcript_buffer.append(transcript_text)
-
-                        if event == "EndOfTurn":
-                            # Prefer the transcript from this event; otherwise fall
-                            # back to any accumulated buffer.
-                            final_transcript = transcript_text or " ".join(self.transcript_buffer)
-                            final_transcript = final_transcript.strip()
-                            if final_transcript:
-                                logger.info(f"Flux EndOfTurn detected: '{final_transcript}'")
-                                # SET FLAGS SYNCHRONOUSLY before scheduling async task
-                                # This prevents race condition where more audio/transcripts
-                                # arrive before the async task runs
-                                self._ignore_transcripts = True
-                                self._pause_audio_sending = True
-                                self.transcript_buffer.clear()
-                                logger.info("Turn switch: flags set synchronously, scheduling handler")
-                                self._create_tracked_task(self._handle_user_turn(final_transcript))
-
-                        return
-
-                def on_open(_):
-                    logger.info(" Deepgram Flux connection opened (listen.v2)")
-
-                def on_close(event):
-                    logger.info(f"Deepgram Flux connection closed: {event}")
-                    # Mark connection as closed so we don't continue sending audio
-                    self.dg_connection = None
-                    self.is_listening = False
-                    # Keep session_active; stop_session() will flip it and clean up
-
-                def on_error(error):
-                    logger.error(f"Deepgram Flux error: {error}")
-
                 # Register event handlers
-                connection.on(EventType.OPEN, on_open)
-                connection.on(EventType.MESSAGE, on_message)
-                connection.on(EventType.CLOSE, on_close)
-                connection.on(EventType.ERROR, on_error)
+                connection.on(EventType.OPEN, self._on_flux_open)
+                connection.on(EventType.MESSAGE, self._on_flux_message)
+                connection.on(EventType.CLOSE, self._on_flux_close)
+                connection.on(EventType.ERROR, self._on_flux_error)
 
                 # Start listening in background
                 self.dg_listen_task = asyncio.create_task(connection.start_listening())
@@ -334,23 +408,7 @@ class ConversationOrchestrator:
                 logger.info(" Deepgram Flux connected and listening (listen.v2)")
 
                 # Main send loop: read from the internal queue and forward to Deepgram
-                while self.session_active and self._dg_audio_queue is not None:
-                    chunk = await self._dg_audio_queue.get()
-                    if chunk is None:
-                        break
-                    # Check audio gate - skip sending if paused (turn switched)
-                    if self._pause_audio_sending:
-                        logger.debug("Skipping audio chunk - audio sending paused")
-                        continue
-                    try:
-                        # For listen.v2, the enhanced send_media method accepts
-                        # raw bytes; constructing a ListenV2MediaMessage directly
-                        # would require keyword args and results in BaseModel
-                        # __init__ errors if used positionally.
-                        await connection.send_media(chunk)
-                    except Exception as e:
-                        logger.error(f"Error sending audio to Deepgram: {e}")
-                        break
+                await self._stream_audio(connection)
 
                 # Allow any remaining events to be processed before closing
                 await asyncio.sleep(0.5)
@@ -404,134 +462,24 @@ class ConversationOrchestrator:
             ) as connection:
                 self.dg_connection = connection
 
-                # Define message handler for Nova listen.v1 streaming
-                def on_message(message) -> None:
-                    msg_type = getattr(message, "type", None)
-
-                    # Handle Results messages (transcripts)
-                    if msg_type == "Results":
-                        # Check if this is a from_finalize response (ignore it)
-                        from_finalize = getattr(message, "from_finalize", False)
-                        if from_finalize:
-                            logger.debug("Ignoring from_finalize response")
-                            return
-
-                        # Ignore transcripts during avatar's turn
-                        if self._ignore_transcripts:
-                            logger.debug("Ignoring Nova transcript during avatar turn")
-                            return
-
-                        try:
-                            channel = getattr(message, "channel", None)
-                            if not channel:
-                                return
-                            alternatives = getattr(channel, "alternatives", [])
-                            if not alternatives:
-                                return
-
-                            transcript = alternatives[0].transcript if alternatives else ""
-                            is_final = getattr(message, "is_final", False)
-                            speech_final = getattr(message, "speech_final", False)
-
-                            if transcript:
-                                logger.debug(
-                                    f"Nova transcript (final={is_final}, speech_final={speech_final}): {transcript}"
-                                )
-
-                                if speech_final:
-                                    # speech_final indicates end of an utterance
-                                    self.transcript_buffer.append(transcript)
-                                    final_transcript = " ".join(self.transcript_buffer).strip()
-                                    if final_transcript:
-                                        logger.info(f"Nova speech_final detected: '{final_transcript}'")
-                                        # SET FLAGS SYNCHRONOUSLY before scheduling async task
-                                        self._ignore_transcripts = True
-                                        self._pause_audio_sending = True
-                                        self.transcript_buffer.clear()
-                                        logger.info("Turn switch: flags set synchronously, scheduling handler")
-                                        self._create_tracked_task(self._handle_user_turn(final_transcript))
-                                elif is_final:
-                                    # Accumulate final transcripts for the current utterance
-                                    self.transcript_buffer.append(transcript)
-                        except Exception as e:
-                            logger.error(f"Error processing Nova transcript: {e}")
-                        return
-
-                    # Handle UtteranceEnd messages (backup turn detection)
-                    if msg_type == "UtteranceEnd":
-                        # Ignore during avatar's turn
-                        if self._ignore_transcripts:
-                            logger.debug("Ignoring Nova UtteranceEnd during avatar turn")
-                            return
-
-                        if self.transcript_buffer:
-                            final_transcript = " ".join(self.transcript_buffer).strip()
-                            if final_transcript:
-                                logger.info(f"Nova UtteranceEnd detected: '{final_transcript}'")
-                                # SET FLAGS SYNCHRONOUSLY before scheduling async task
-                                self._ignore_transcripts = True
-                                self._pause_audio_sending = True
-                                self.transcript_buffer.clear()
-                                logger.info("Turn switch: flags set synchronously, scheduling handler")
-                                self._create_tracked_task(self._handle_user_turn(final_transcript))
-                        return
-
-                    # Handle SpeechStarted
-                    if msg_type == "SpeechStarted":
-                        logger.debug("Nova speech started")
-                        return
-
-                    # Handle Metadata
-                    if msg_type == "Metadata":
-                        logger.debug(f"Nova metadata: {message}")
-                        return
-
-                def on_open(_):
-                    logger.info("Deepgram Nova connection opened (listen.v1)")
-
-                def on_close(event):
-                    logger.info(f"Deepgram Nova connection closed: {event}")
-                    self.dg_connection = None
-                    self.is_listening = False
-
-                def on_error(error):
-                    logger.error(f"Deepgram Nova error: {error}")
-
                 # Register event handlers
-                connection.on(EventType.OPEN, on_open)
-                connection.on(EventType.MESSAGE, on_message)
-                connection.on(EventType.CLOSE, on_close)
-                connection.on(EventType.ERROR, on_error)
+                connection.on(EventType.OPEN, self._on_nova_open)
+                connection.on(EventType.MESSAGE, self._on_nova_message)
+                connection.on(EventType.CLOSE, self._on_nova_close)
+                connection.on(EventType.ERROR, self._on_nova_error)
 
                 # Start listening in background
                 self.dg_listen_task = asyncio.create_task(connection.start_listening())
 
-                # KeepAlive task to prevent NET-0001 timeout (10s without audio)
-                keepalive_task = asyncio.create_task(self._nova_keepalive_loop(connection))
+                # KeepAlive timer to prevent NET-0001 timeout (10s without audio)
+                self._schedule_nova_keepalive(connection)
 
                 logger.info(f"Deepgram {model} connected and listening (listen.v1)")
 
                 # Main send loop: read from the internal queue and forward to Deepgram
-                while self.session_active and self._dg_audio_queue is not None:
-                    chunk = await self._dg_audio_queue.get()
-                    if chunk is None:
-                        break
-                    # Check audio gate - skip sending if paused (turn switched)
-                    if self._pause_audio_sending:
-                        logger.debug("Skipping audio chunk - audio sending paused")
-                        continue
-                    try:
-                        await connection.send_media(chunk)
-                    except Exception as e:
-                        logger.error(f"Error sending audio to Deepgram Nova: {e}")
-                        break
+                await self._stream_audio(connection)
 
-                # Cancel keepalive task
-                keepalive_task.cancel()
-                try:
-                    await keepalive_task
-                except asyncio.CancelledError:
-                    pass
+                self._cancel_nova_keepalive()
 
                 # Allow any remaining events to be processed before closing
                 await asyncio.sleep(0.5)
@@ -539,6 +487,8 @@ class ConversationOrchestrator:
         except Exception as e:
             logger.error(f"Failed to connect to Deepgram Nova: {e}")
         finally:
+            self._cancel_nova_keepalive()
+
             # Ensure listener task is cleaned up
             if self.dg_listen_task:
                 if not self.dg_listen_task.done():
@@ -551,18 +501,257 @@ class ConversationOrchestrator:
 
             self.dg_connection = None
 
-    async def _nova_keepalive_loop(self, connection):
-        """Send KeepAlive messages every 5 seconds to prevent NET-0001 timeout."""
-        keepalive_msg = ListenV1ControlMessage(type="KeepAlive")
-        while True:
-            await asyncio.sleep(5)
-            try:
-                await connection.send_control(keepalive_msg)
-                logger.debug("Nova KeepAlive sent")
-            except Exception as e:
-                logger.warning(f"Failed to send Nova KeepAlive: {e}")
+    # Flux listen.v2 event handlers
+
+    def _on_flux_open(self, _) -> None:
+        logger.info(" Deepgram Flux connection opened (listen.v2)")
+
+    def _on_flux_close(self, event) -> None:
+        logger.info(f"Deepgram Flux connection closed: {event}")
+        # Mark connection as closed so we don't continue sending audio
+        self.dg_connection = None
+        self.is_listening = False
+        # Keep session_active; stop_session() will flip it and clean up
+
+    def _on_flux_error(self, error) -> None:
+        logger.error(f"Deepgram Flux error: {error}")
+
+    def _on_flux_message(self, message) -> None:
+        """Dispatch a Flux message to its handler by type."""
+        try:
+            handler = self._FLUX_HANDLERS.get(_get_type(message))
+        except AttributeError:
+            return
+        if handler is not None:
+            handler(self, message)
+
+    def _on_flux_connected(self, message) -> None:
+        # Connected event (initial handshake/configuration)
+        logger.info("Deepgram Flux connected event received")
+
+    def _on_flux_fatal_error(self, message) -> None:
+        error_message = getattr(message, "message", None)
+        logger.error(f"Deepgram Flux fatal error: {error_message or message}")
+        # Stop listening on fatal error; the worker loop will exit
+        self.is_listening = False
+
+    def _on_flux_turn_info(self, message) -> None:
+        # TurnInfo events carry transcript updates and EndOfTurn signals.
+        # Ignore transcripts during avatar's turn
+        if self._gate_flags & _GATE_IGNORE_TX:
+            logger.debug("Ignoring Flux TurnInfo during avatar turn")
+            return
+
+        event, transcript_text = _get_turn_info(message)
+        transcript_text = transcript_text or ""
+        if transcript_text:
+            logger.debug("Flux TurnInfo (%s): %s", event, transcript_text)
+
+        if event != "EndOfTurn":
+            if transcript_text:
+                # Accumulate transcript text for this turn
+                self._append_transcript(transcript_text)
+            return
+
+        # EndOfTurn carries the transcript for the whole turn, which
+        # supersedes the interim buffer; the buffer is only a fallback
+        # when the event arrives without text.
+        if transcript_text:
+            final_transcript = transcript_text.strip()
+        else:
+            final_transcript = " ".join(self.transcript_buffer).strip()
+        if final_transcript:
+            logger.info(f"Flux EndOfTurn detected: '{final_transcript}'")
+            # SET FLAGS SYNCHRONOUSLY before scheduling async task
+            # This prevents race condition where more audio/transcripts
+            # arrive before the async task runs
+            self._gate_flags = _GATE_AVATAR_TURN
+            self._clear_transcript()
+            logger.info("Turn switch: flags set synchronously, scheduling handler")
+            self._create_tracked_task(self._handle_user_turn(final_transcript))
+
+    _FLUX_HANDLERS = {
+        "Connected": _on_flux_connected,
+        "FatalError": _on_flux_fatal_error,
+        "TurnInfo": _on_flux_turn_info,
+    }
+
+    # Nova listen.v1 event handlers
+
+    def _on_nova_open(self, _) -> None:
+        logger.info("Deepgram Nova connection opened (listen.v1)")
+
+    def _on_nova_close(self, event) -> None:
+        logger.info(f"Deepgram Nova connection closed: {event}")
+        self.dg_connection = None
+        self.is_listening = False
+
+    def _on_nova_error(self, error) -> None:
+        logger.error(f"Deepgram Nova error: {error}")
+
+    def _on_nova_message(self, message) -> None:
+        """Dispatch a Nova message to its handler by type."""
+        try:
+            handler = self._NOVA_HANDLERS.get(_get_type(message))
+        except AttributeError:
+            return
+        if handler is not None:
+            handler(self, message)
+
+    def _on_nova_results(self, message) -> None:
+        # Check if this is a from_finalize response (ignore it)
+        if getattr(message, "from_finalize", False):
+            logger.debug("Ignoring from_finalize response")
+            return
+
+        # Ignore transcripts during avatar's turn
+        if self._gate_flags & _GATE_IGNORE_TX:
+            logger.debug("Ignoring Nova transcript during avatar turn")
+            return
+
+        try:
+            channel = getattr(message, "channel", None)
+            if not channel:
+                return
+            alternatives = getattr(channel, "alternatives", [])
+            if not alternatives:
+                return
+
+            transcript = alternatives[0].transcript
+            if not transcript:
+                return
+
+            is_final, speech_final = _get_result_flags(message)
+            logger.debug("Nova transcript (final=%s, speech_final=%s): %s", is_final, speech_final, transcript)
+
+            if speech_final:
+                # speech_final indicates end of an utterance
+                self._append_transcript(transcript)
+                final_transcript = " ".join(self.transcript_buffer).strip()
+                if final_transcript:
+                    logger.info(f"Nova speech_final detected: '{final_transcript}'")
+                    # SET FLAGS SYNCHRONOUSLY before scheduling async task
+                    self._gate_flags = _GATE_AVATAR_TURN
+                    self._clear_transcript()
+                    logger.info("Turn switch: flags set synchronously, scheduling handler")
+                    self._create_tracked_task(self._handle_user_turn(final_transcript))
+            elif is_final:
+                # Accumulate final transcripts for the current utterance
+                self._append_transcript(transcript)
+        except Exception as e:
+            logger.error(f"Error processing Nova transcript: {e}")
+
+    def _on_nova_utterance_end(self, message) -> None:
+        # Backup turn detection. Ignore during avatar's turn
+        if self._gate_flags & _GATE_IGNORE_TX:
+            logger.debug("Ignoring Nova UtteranceEnd during avatar turn")
+            return
+
+        transcript_buffer = self.transcript_buffer
+        if transcript_buffer:
+            final_transcript = " ".join(transcript_buffer).strip()
+            if final_transcript:
+                logger.info(f"Nova UtteranceEnd detected: '{final_transcript}'")
+                # SET FLAGS SYNCHRONOUSLY before scheduling async task
+                self._gate_flags = _GATE_AVATAR_TURN
+                self._clear_transcript()
+                logger.info("Turn switch: flags set synchronously, scheduling handler")
+                self._create_tracked_task(self._handle_user_turn(final_transcript))
+
+    def _on_nova_speech_started(self, message) -> None:
+        logger.debug("Nova speech started")
+
+    def _on_nova_metadata(self, message) -> None:
+        logger.debug("Nova metadata: %s", message)
+
+    _NOVA_HANDLERS = {
+        "Results": _on_nova_results,
+        "UtteranceEnd": _on_nova_utterance_end,
+        "SpeechStarted": _on_nova_speech_started,
+        "Metadata": _on_nova_metadata,
+    }
+
+    async def _stream_audio(self, connection):
+        """Forward queued audio chunks to a Deepgram connection.
+
+        Runs until the session ends, the queue is closed with a None sentinel,
+        or a send fails.
+        """
+        audio = self._dg_audio_deque
+        ready = self._dg_audio_event
+        send = self._audio_sender(connection)
+        while self.session_active and self._dg_audio_deque is not None:
+            if not audio:
+                ready.clear()
+                await ready.wait()
+                continue
+            # Drain whatever is already queued into a single send
+            chunks = []
+            closed = False
+            while audio and len(chunks) < _MAX_AUDIO_BATCH:
+                chunk = audio.popleft()
+                if chunk is None:
+                    closed = True
+                    break
+                chunks.append(chunk)
+            # Check audio gate - skip sending if paused (turn switched). Also
+            # checked in process_audio; this catches chunks queued just before EOT.
+            if self._gate_flags & _GATE_PAUSE_AUDIO:
+                logger.debug("Skipping %d audio chunks - audio sending paused", len(chunks))
+            elif chunks:
+                try:
+                    await send(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+                except Exception as e:
+                    logger.error(f"Error sending audio to Deepgram: {e}")
+                    break
+            if closed:
                 break
 
+    @staticmethod
+    def _audio_sender(connection) -> Callable[[bytes], Awaitable[None]]:
+        """Return the coroutine function used to push audio to a Deepgram connection.
+
+        With DEEPGRAM_RAW_AUDIO_SEND enabled, linear16 frames are written straight
+        to the SDK's underlying websocket, skipping its send wrapper. This relies on
+        a private attribute, so fall back to send_media when it isn't there.
+        """
+        if settings.DEEPGRAM_RAW_AUDIO_SEND:
+            ws = getattr(connection, "_websocket", None)
+            if ws is not None and callable(getattr(ws, "send", None)):
+                return ws.send
+            logger.warning("Deepgram connection has no raw websocket; using send_media")
+        # For listen.v2, the enhanced send_media method accepts raw bytes;
+        # constructing a ListenV2MediaMessage directly would require keyword args
+        # and results in BaseModel __init__ errors if used positionally.
+        return connection.send_media
+
+    def _schedule_nova_keepalive(self, connection) -> None:
+        """Arm a timer that sends a KeepAlive in 5 seconds to prevent NET-0001 timeout."""
+        loop = asyncio.get_running_loop()
+        self._keepalive_handle = loop.call_later(5, self._fire_nova_keepalive, connection)
+
+    def _cancel_nova_keepalive(self) -> None:
+        """Stop sending KeepAlive messages."""
+        if self._keepalive_handle is not None:
+            self._keepalive_handle.cancel()
+            self._keepalive_handle = None
+
+    def _fire_nova_keepalive(self, connection) -> None:
+        """Timer callback: the send itself is async, so run it as a task."""
+        self._create_tracked_task(self._send_nova_keepalive(connection))
+
+    async def _send_nova_keepalive(self, connection) -> None:
+        """Send one KeepAlive and re-arm the timer unless keepalives were cancelled."""
+        try:
+            await connection.send_control(_KEEPALIVE_MSG)
+            logger.debug("Nova KeepAlive sent")
+        except Exception as e:
+            logger.warning(f"Failed to send Nova KeepAlive: {e}")
+            self._keepalive_handle = None
+            return
+        if self._keepalive_handle is not None:
+            self._schedule_nova_keepalive(connection)
+
     async def _ensure_deepgram_connection(self):
         """Create a Deepgram connection if one isn't active."""
         if self._dg_worker_task and not self._dg_worker_task.done():
@@ -570,8 +759,9 @@ class ConversationOrchestrator:
         async with self._dg_connect_lock:
             if self._dg_worker_task and not self._dg_worker_task.done():
                 return
-            if self._dg_audio_queue is None:
-                self._dg_audio_queue = asyncio.Queue()
+            if self._dg_audio_deque is None:
+                self._dg_audio_deque = deque()
+                self._dg_audio_event = asyncio.Event()
 
             # Route to appropriate connection method based on ASR model
             if self.asr_model == ASRModel.FLUX:
@@ -580,23 +770,18 @@ class ConversationOrchestrator:
                 # Nova-3 or Nova-2
                 self._dg_worker_task = asyncio.create_task(self._connect_deepgram_nova())
 
-    async def _drain_audio_queue(self):
+    def _drain_audio_queue(self):
         """Drain pending audio from the queue to prevent stale audio from being sent.
 
         Called when turn switches to avatar to discard any queued audio chunks
         that would otherwise be sent to Deepgram and potentially trigger unwanted
         transcripts from continued user speech after EOT detection.
         """
-        if self._dg_audio_queue is None:
+        if self._dg_audio_deque is None:
             return
 
-        drained_count = 0
-        while not self._dg_audio_queue.empty():
-            try:
-                self._dg_audio_queue.get_nowait()
-                drained_count += 1
-            except asyncio.QueueEmpty:
-                break
+        drained_count = len(self._dg_audio_deque)
+        self._dg_audio_deque.clear()
 
         if drained_count > 0:
             logger.info(f"Drained {drained_count} audio chunks from queue on turn switch")
@@ -621,17 +806,34 @@ class ConversationOrchestrator:
 
         try:
             # Send Finalize control message (Nova only)
-            finalize_msg = ListenV1ControlMessage(type="Finalize")
-            await self.dg_connection.send_control(finalize_msg)
+            await self.dg_connection.send_control(_FINALIZE_MSG)
             logger.info("Sent Finalize message to Deepgram Nova")
         except Exception as e:
             logger.warning(f"Failed to send Finalize to Deepgram: {e}")
 
+    def _append_transcript(self, text: str) -> None:
+        """Add text to the current turn's transcript, bounded by the _MAX_TRANSCRIPT_* caps."""
+        buffer = self.transcript_buffer
+        if len(buffer) == buffer.maxlen:
+            # append() below evicts the oldest piece
+            self._transcript_chars -= len(buffer[0]) + 1
+        buffer.append(text)
+        self._transcript_chars += len(text) + 1
+        while self._transcript_chars > _MAX_TRANSCRIPT_CHARS and len(buffer) > 1:
+            self._transcript_chars -= len(buffer.popleft()) + 1
+
+    def _clear_transcript(self) -> None:
+        """Discard the current turn's transcript."""
+        self.transcript_buffer.clear()
+        self._transcript_chars = 0
+
     def _create_tracked_task(self, coro) -> asyncio.Task:
         """Create a task and track it to handle exceptions."""
         task = asyncio.create_task(coro)
         self._pending_tasks.add(task)
         task.add_done_callback(self._on_task_done)
+        if len(self._pending_tasks) > _PENDING_TASKS_WARN:
+            logger.warning("Background task backlog=%d", len(self._pending_tasks))
         return task
 
     def _on_task_done(self, task: asyncio.Task) -> None:
@@ -660,13 +862,13 @@ class ConversationOrchestrator:
 
     async def _handle_user_turn(self, text: str):
         """Handle detected user speech with streaming LLM response."""
-        # Note: _ignore_transcripts and _pause_audio_sending are already set
+        # Note: the transcript and audio gates in _gate_flags are already set
         # synchronously in the on_message callback before this task was scheduled
         self.is_listening = False
         self.avatar_turn_active = True  # Mark turn as active until ready_to_listen
 
         # Drain any remaining audio from queue
-        await self._drain_audio_queue()
+        self._drain_audio_queue()
 
         # Send Finalize to Deepgram to flush any buffered audio on server side
         # This ensures no leftover transcripts arrive after turn switch
@@ -693,7 +895,7 @@ class ConversationOrchestrator:
                 if not sentence.strip():
                     continue
 
-                logger.debug(f"Received from _stream_response: sentence='{sentence[:50]}...', expression={expression}")
+                logger.debug("Received from _stream_response: sentence='%.50s...', expression=%s", sentence, expression)
 
                 # Use expression from first sentence for consistency
                 if first_sentence:
@@ -753,28 +955,7 @@ class ConversationOrchestrator:
 
         try:
             # Build messages with conversation history
-            # Add language instruction if not English
-            language_instruction = ""
-            if self.language != "en":
-                lang_name = get_language_display_name(self.language)
-                language_instruction = (
-                    f"\n\nIMPORTANT: You MUST respond in {lang_name}. All your responses should be in {lang_name}."
-                )
-
-            expressions_list = ", ".join(Expression.values())
-            messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        f"{self.system_prompt}{language_instruction}\n\n"
-                        "IMPORTANT: Start your response with a JSON prefix containing the expression, "
-                        "then a newline, then your natural response text.\n"
-                        'Format: {"expression": "<emotion>"}\n<your response>\n\n'
-                        f"Expressions: {expressions_list}\n"
-                        f'Example:\n{{"expression": "{Expression.HAPPY.value}"}}\nHello! It\'s great to meet you.'
-                    ),
-                },
-            ]
+            messages = [self._system_message or self._build_system_message()]
             # Add conversation history
             messages.extend(self.conversation_history)
             # Add current user message
@@ -803,11 +984,10 @@ class ConversationOrchestrator:
                     total_content += content
                     # Try to extract expression from JSON prefix
                     if not expression_extracted:
-                        expr_result, remaining = accumulator.try_extract_expression(content)
+                        expr_result, content = accumulator.try_extract_expression(content)
                         if expr_result:
                             extracted_expression = expr_result
                             expression_extracted = True
-                            content = remaining
                             logger.info(f"Extracted expression from LLM: '{extracted_expression}'")
                         elif accumulator.buffer_has_expression_prefix():
                             # Still accumulating JSON prefix, don't emit yet
@@ -818,7 +998,7 @@ class ConversationOrchestrator:
                         full_response_text += sentence + " "
                         # Yield expression only with first sentence
                         yield (sentence, extracted_expression)
-                        logger.debug(f"Yielded sentence with expression={extracted_expression}: {sentence[:50]}...")
+                        logger.debug("Yielded sentence with expression=%s: %.50s...", extracted_expression, sentence)
                         extracted_expression = None  # Only yield expression once
 
             # Yield any remaining content as final sentence
@@ -839,6 +1019,34 @@ class ConversationOrchestrator:
             logger.error(f"Error streaming response: {e}")
             yield (get_error_message(self.language), Expression.default().value)
 
+    def _build_system_message(self) -> dict:
+        """Compose and cache the streaming system message for this session.
+
+        The prompt, language and expression list are fixed once the session has
+        started, so the same dict is reused for every turn.
+        """
+        # Add language instruction if not English
+        language_instruction = ""
+        if self.language != "en":
+            lang_name = get_language_display_name(self.language)
+            language_instruction = (
+                f"\n\nIMPORTANT: You MUST respond in {lang_name}. All your responses should be in {lang_name}."
+            )
+
+        expressions_list = ", ".join(Expression.values())
+        self._system_message = {
+            "role": "system",
+            "content": (
+                f"{self.system_prompt}{language_instruction}\n\n"
+                "IMPORTANT: Start your response with a JSON prefix containing the expression, "
+                "then a newline, then your natural response text.\n"
+                'Format: {"expression": "<emotion>"}\n<your response>\n\n'
+                f"Expressions: {expressions_list}\n"
+                f'Example:\n{{"expression": "{Expression.HAPPY.value}"}}\nHello! It\'s great to meet you.'
+            ),
+        }
+        return self._system_message
+
     async def _generate_response(self, user_text: str) -> dict:
         """Generate response using LiteLLM (non-streaming fallback)."""
         try:
@@ -868,15 +1076,80 @@ class ConversationOrchestrator:
             return {"text": get_error_message(self.language), "expression": Expression.default().value}
 
     def _add_to_history(self, role: str, content: str) -> None:
-        """Add a message to conversation history, trimming to max length."""
+        """Add a message to conversation history, condensing it once over max length.
+
+        History is only ever appended to between trims, so the prompt (system
+        message + history) grows append-only and the provider's prefix cache keeps
+        hitting. Once over the limit, everything older than the newest half of the
+        window is summarized in the background (see _summarize_history), or, with
+        summarization disabled, dropped apart from the first _cache_anchor_len
+        messages.
+        """
         if not content.strip():
             return
 
-        self.conversation_history.append({"role": role, "content": content})
+        history = self.conversation_history
+        history.append({"role": role, "content": content})
 
-        # Trim to max messages (keep most recent)
-        if len(self.conversation_history) > self.max_history_messages:
-            self.conversation_history = self.conversation_history[-self.max_history_messages :]
+        if len(history) <= self.max_history_messages:
+            return
+        if settings.LLM_SUMMARY_MODEL:
+            if self._summary_task is None or self._summary_task.done():
+                block = history[: self._history_cut()]
+                self._summary_task = self._create_tracked_task(self._summarize_history(block))
+            return
+        self._trim_history()
+
+    def _history_cut(self) -> int:
+        """Return the index where the kept tail (newest half of the window) starts."""
+        history = self.conversation_history
+        cut = len(history) - self.max_history_messages // 2
+        # Don't start the kept tail on an assistant reply without its user message
+        if cut < len(history) and history[cut]["role"] == "assistant":
+            cut += 1
+        return cut
+
+    def _trim_history(self) -> None:
+        """Drop the messages between the anchor and the kept tail."""
+        anchor = min(self._cache_anchor_len, len(self.conversation_history))
+        del self.conversation_history[anchor : max(anchor, self._history_cut())]
+
+    async def _summarize_history(self, block: list[dict]) -> None:
+        """Replace the oldest history messages with a single summary message.
+
+        The summary becomes the new anchor, so later summaries roll it forward.
+        Falls back to _trim_history() if the summary request fails.
+        """
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in block)
+        try:
+            response = await asyncio.wait_for(
+                acompletion(
+                    model=settings.LLM_SUMMARY_MODEL,
+                    messages=[
+                        {"role": "system", "content": _SUMMARY_PROMPT},
+                        {"role": "user", "content": transcript},
+                    ],
+                    api_key=settings.OPENAI_API_KEY,
+                ),
+                timeout=settings.LLM_TIMEOUT,
+            )
+            summary = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            logger.warning(f"History summarization failed, trimming instead: {e}")
+            summary = ""
+
+        # History may have been cleared while the request was in flight
+        history = self.conversation_history
+        if len(history) < len(block) or any(a is not b for a, b in zip(history, block)):
+            return
+
+        if not summary:
+            self._trim_history()
+            return
+
+        history[: len(block)] = [{"role": "system", "content": f"Prior conversation summary: {summary}"}]
+        self._cache_anchor_len = 1
+        logger.info("Summarized %d history messages", len(block))
 
     def clear_history(self) -> None:
         """Clear conversation history."""
@@ -928,9 +1201,8 @@ class ConversationOrchestrator:
             return
 
         # Clear any accumulated transcripts and re-enable transcript processing
-        self.transcript_buffer.clear()
-        self._ignore_transcripts = False
-        self._pause_audio_sending = False
+        self._clear_transcript()
+        self._gate_flags = 0
         logger.info("Transcript processing re-enabled, audio sending resumed, buffer cleared")
 
         if not self.is_listening:
@@ -940,19 +1212,43 @@ class ConversationOrchestrator:
                 await self.on_status_change("listening")
 
 
+def _find_sentence_end(text: str, start: int) -> int:
+    """Return the offset just past the first sentence end at or after start, or -1.
+
+    A sentence end is '.', '!' or '?' followed by whitespace (which is consumed)
+    or by the end of the text.
+    """
+    find = text.find
+    n = len(text)
+    while True:
+        i = -1
+        for mark in ".!?":
+            j = find(mark, start)
+            if j != -1 and (i == -1 or j < i):
+                i = j
+        if i == -1:
+            return -1
+        end = i + 1
+        if end == n:
+            return end
+        if not text[end].isspace():
+            start = end
+            continue
+        end += 1
+        while end < n and text[end].isspace():
+            end += 1
+        return end
+
+
 class SentenceAccumulator:
     """Accumulates streaming tokens and emits complete sentences.
 
     Handles JSON expression prefix extraction and sentence boundary detection.
     """
 
-    # Sentence-ending punctuation followed by space or end of string
-    SENTENCE_END_PATTERN = re.compile(r"([.!?])(?:\s+|$)")
-    # JSON expression prefix pattern
-    EXPRESSION_PATTERN = re.compile(r'^\s*\{\s*"expression"\s*:\s*"(\w+)"\s*\}\s*\n?')
-
     def __init__(self):
         self.buffer = ""
+        self._scan_pos = 0  # Buffer offset before which no sentence end can start
         self._json_prefix_buffer = ""
         self._json_complete = False
 
@@ -966,14 +1262,28 @@ class SentenceAccumulator:
 
         self._json_prefix_buffer += content
 
-        # Check if we have a complete JSON prefix
-        match = self.EXPRESSION_PATTERN.match(self._json_prefix_buffer)
-        if match:
-            expression = match.group(1)
-            remaining = self._json_prefix_buffer[match.end() :]
-            self._json_complete = True
+        # Cheap checks first: a reply that doesn't open with "{" has no prefix,
+        # and raw_decode cannot succeed until a "}" has arrived
+        stripped = self._json_prefix_buffer.lstrip()
+        if stripped and stripped[0] != "{":
+            remaining = self._json_prefix_buffer
             self._json_prefix_buffer = ""
-            return expression, remaining
+            self._json_complete = True
+            return None, remaining
+
+        if "}" in stripped:
+            try:
+                prefix, end = _EXPRESSION_DECODER.raw_decode(stripped)
+            except json.JSONDecodeError:
+                pass  # Incomplete or not JSON yet, keep accumulating
+            else:
+                expression = prefix.get("expression") if isinstance(prefix, dict) else None
+                self._json_complete = True
+                self._json_prefix_buffer = ""
+                if isinstance(expression, str) and expression.isidentifier():
+                    return expression, stripped[end:].lstrip()
+                # Valid JSON but not a usable expression prefix, treat it as text
+                return None, stripped
 
         # If buffer is getting long without finding JSON, treat as regular text
         if len(self._json_prefix_buffer) > 100 or "\n" in self._json_prefix_buffer:
@@ -997,19 +1307,23 @@ class SentenceAccumulator:
         self.buffer += content
         sentences = []
 
-        # Find sentence boundaries
+        # Find sentence boundaries, scanning only text not already ruled out
         while True:
-            match = self.SENTENCE_END_PATTERN.search(self.buffer)
-            if not match:
+            end_pos = _find_sentence_end(self.buffer, self._scan_pos)
+            if end_pos == -1:
                 if len(self.buffer) > 400:
                     sentences.append(self.buffer)
                     self.buffer = ""
+                    self._scan_pos = 0
+                else:
+                    # Back up one char so punctuation at a chunk boundary is rechecked
+                    self._scan_pos = max(0, len(self.buffer) - 1)
                 break
 
             # Extract complete sentence including punctuation
-            end_pos = match.end()
             sentence = self.buffer[:end_pos].strip()
             self.buffer = self.buffer[end_pos:]
+            self._scan_pos = 0
 
             if sentence:
                 sentences.append(sentence)
@@ -1021,4 +1335,5 @@ class SentenceAccumulator:
         remaining = self._json_prefix_buffer.strip() + self.buffer.strip()
         self._json_prefix_buffer = ""
         self.buffer = ""
+        self._scan_pos = 0
         return remaining
@@ -628,41 +628,11 @@ startBtn.onclick = async () => {
             segmentQueue.push(videoChunk);
             pumpSegmentQueue();
         } else {
-            // Text frame - JSON control message
-            const msg = JSON.parse(event.data);
-
-            if (msg.type === 'session_ready') {
-                console.log("Session ready:", msg.data.session_id);
-                stopBtn.disabled = false;
-
-                // Start video playback with cross-browser compatibility
-                // Mute initially to ensure autoplay works, then unmute
-                // (video from avatar typically has no audio track, but this ensures compatibility)
-                avatarVideo.muted = true;
-                const playPromise = avatarVideo.play();
-                if (playPromise !== undefined) {
-                    playPromise
-                        .then(() => {
-                            console.log('Video playback started successfully');
-                            // Unmute after successful play (for browsers that require muted autoplay)
-                            avatarVideo.muted = false;
-                        })
-                        .catch(err => {
-                            console.error('Video play() failed:', err);
-                            // Try again with user gesture requirement notification
-                        });
+            // Text frame - newline-delimited JSON control messages
+            for (const line of event.data.split('\n')) {
+                if (line) {
+                    await handleControlMessage(JSON.parse(line));
                 }
-
-                // Start microphone
-                await startAudioCapture();
-                setStatus('listening');
-
-                // Start buffer monitoring and playback watchdog
-                startBufferMonitoring();
-                startPlaybackWatchdog();
-
-            } else if (msg.type === 'status') {
-                setStatus(msg.data);
             }
         }
     };
@@ -677,6 +647,42 @@ startBtn.onclick = async () => {
     };
 };
 
+async function handleControlMessage(msg) {
+    if (msg.type === 'session_ready') {
+        console.log("Session ready:", msg.data.session_id);
+        stopBtn.disabled = false;
+
+        // Start video playback with cross-browser compatibility
+        // Mute initially to ensure autoplay works, then unmute
+        // (video from avatar typically has no audio track, but this ensures compatibility)
+        avatarVideo.muted = true;
+        const playPromise = avatarVideo.play();
+        if (playPromise !== undefined) {
+            playPromise
+                .then(() => {
+                    console.log('Video playback started successfully');
+                    // Unmute after successful play (for browsers that require muted autoplay)
+                    avatarVideo.muted = false;
+                })
+                .catch(err => {
+                    console.error('Video play() failed:', err);
+                    // Try again with user gesture requirement notification
+                });
+        }
+
+        // Start microphone
+        await startAudioCapture();
+        setStatus('listening');
+
+        // Start buffer monitoring and playback watchdog
+        startBufferMonitoring();
+        startPlaybackWatchdog();
+
+    } else if (msg.type === 'status') {
+        setStatus(msg.data);
+    }
+}
+
 stopBtn.onclick = stopSession;
 if (floatingStopBtn) {
     floatingStopBtn.onclick = stopSession;
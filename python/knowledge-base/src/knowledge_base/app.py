@@ -1,49 +1,99 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, List
+import heapq
+import logging
+from typing import Any, Dict, List, Tuple
 import json
 import uuid
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime, timedelta, timezone
 
-import requests
+import httpx
 from fastapi import FastAPI, Request, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from .config import settings
 from .data import KnowledgeBase
-from .openai_client import chat_complete, transcribe_audio_bytes
+from .openai_client import (
+    build_async_openai_client,
+    chat_complete,
+    ChatCompletionError,
+    chat_complete_sentences,
+    transcribe_audio_bytes,
+)
 from .avatartalk_client import inference
 
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
 
 TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
 # Ephemeral storage for pending streaming requests
 pending_streams: Dict[str, Dict[str, Any]] = {}
+# (expires_at, sid) min-heap so the janitor only wakes for the next real expiry
+_expiry_heap: List[Tuple[datetime, str]] = []
 STREAM_TTL = timedelta(minutes=10)
+# Keep the X-Assistant-Text header well under common proxy/server header limits
+MAX_TEXT_HEADER_LEN = 4096
+
+
+async def prewarm_connections(app) -> None:
+    """Open pooled HTTPS connections so the first user turn skips the handshakes."""
+
+    async def warm_avatartalk() -> None:
+        await app.state.http.head(settings.avatartalk_base_url)
+
+    async def warm_openai() -> None:
+        await build_async_openai_client().models.retrieve(settings.openai_model)
+
+    results = await asyncio.gather(
+        warm_avatartalk(), warm_openai(), return_exceptions=True
+    )
+    for name, result in zip(("AvatarTalk", "OpenAI"), results):
+        if isinstance(result, Exception):
+            logger.warning("Could not pre-warm %s connection: %s", name, result)
+
+
+async def inference_or_error(text: str, **overrides: Any) -> Dict[str, Any]:
+    """Run AvatarTalk inference off the event loop, reporting failures inline."""
+    try:
+        return await asyncio.to_thread(inference, text, **overrides)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 
 async def lifespan(app) -> None:
     async def janitor() -> None:
         while True:
-            await asyncio.sleep(60)
             now = datetime.now(timezone.utc)
-            expired = [
-                sid
-                for sid, info in list(pending_streams.items())
-                if info.get("expires_at") and info["expires_at"] < now
-            ]
-            for sid in expired:
+            while _expiry_heap and _expiry_heap[0][0] <= now:
+                _, sid = heapq.heappop(_expiry_heap)
+                # Streams already consumed were popped by stream_video
                 pending_streams.pop(sid, None)
+            # Every entry gets the same TTL, so nothing added meanwhile can expire sooner
+            delay = _expiry_heap[0][0] - now if _expiry_heap else STREAM_TTL
+            await asyncio.sleep(delay.total_seconds())
+
+    # Shared async client so concurrent video streams don't tie up threadpool workers
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(None, connect=10.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
 
     # store task to cancel on shutdown
     app.state.knowledge_base = KnowledgeBase()
-    app.state.knowledge_base.create_and_initialize_vector_store(
+    await app.state.knowledge_base.create_and_initialize_vector_store(
         settings.vector_store_name, settings.knowledge_base_directory_path
     )
+    await prewarm_connections(app)
     app.state._janitor_task = asyncio.create_task(janitor())
 
     yield
@@ -54,6 +104,8 @@ async def lifespan(app) -> None:
     if task:
         task.cancel()
 
+    await app.state.http.aclose()
+
 
 app = FastAPI(title="AvatarTalk - Knowledge-powered chat", lifespan=lifespan)
 
@@ -83,6 +135,8 @@ async def chat(request: Request, payload: Dict[str, Any]) -> JSONResponse:
     """
     Accepts: {"user_text": str, "history": [{role, content}]?}
     Returns: {"assistant_text": str, "inference": {...}} (inference may include mp4_url/html_url)
+    With AVATARTALK_PIPELINE_INFERENCE, also returns "segments": [{"text", "inference"}]
+    with one video per sentence, and "inference" is the first segment's result.
     """
     user_text = (payload or {}).get("user_text")
     history: List[Dict[str, str]] = (payload or {}).get("history") or []
@@ -96,27 +150,52 @@ async def chat(request: Request, payload: Dict[str, Any]) -> JSONResponse:
             messages.append({"role": msg["role"], "content": msg["content"]})
     messages.append({"role": "user", "content": user_text})
 
-    assistant_text = chat_complete(
-        messages, request.app.state.knowledge_base.vector_store_id
-    )
-
     # Optional overrides from payload
     avatar = (payload or {}).get("avatar") or None
     emotion = (payload or {}).get("emotion") or None
     language = (payload or {}).get("language") or None
 
-    # Generate video via AvatarTalk /inference for the assistant's text
-    at_json: Dict[str, Any] = {}
-    try:
-        at_json = inference(
-            assistant_text,
-            avatar=avatar,
-            emotion=emotion,
-            language=language,
+    vector_store_id = request.app.state.knowledge_base.vector_store_id
+
+    if settings.pipeline_inference:
+        # Start each sentence's video while the model is still writing the next one
+        sentences: List[str] = []
+        tasks: List[asyncio.Task] = []
+        try:
+            async for sentence in chat_complete_sentences(messages, vector_store_id):
+                sentences.append(sentence)
+                tasks.append(
+                    asyncio.create_task(
+                        inference_or_error(
+                            sentence, avatar=avatar, emotion=emotion, language=language
+                        )
+                    )
+                )
+        except ChatCompletionError as e:
+            for task in tasks:
+                task.cancel()
+            return JSONResponse({"error": str(e)}, status_code=502)
+        results = await asyncio.gather(*tasks)
+        return JSONResponse(
+            {
+                "assistant_text": " ".join(sentences),
+                "inference": results[0] if results else {},
+                "segments": [
+                    {"text": sentence, "inference": result}
+                    for sentence, result in zip(sentences, results)
+                ],
+            }
         )
-    except Exception as e:
-        # Return error but keep assistant_text
-        at_json = {"status": "error", "message": str(e)}
+
+    try:
+        assistant_text = await chat_complete(messages, vector_store_id)
+    except ChatCompletionError as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+
+    # Generate video via AvatarTalk /inference for the assistant's text
+    at_json = await inference_or_error(
+        assistant_text, avatar=avatar, emotion=emotion, language=language
+    )
 
     return JSONResponse(
         {
@@ -133,8 +212,8 @@ async def voice(
     history: str | None = Form(None),
 ) -> JSONResponse:
     try:
-        data = await audio.read()
-        if not data:
+        # UploadFile is already spooled, so hand its file over instead of reading it
+        if not audio.size:
             return JSONResponse({"error": "empty audio"}, status_code=400)
         # Parse history if provided
         msgs: List[Dict[str, str]] = []
@@ -150,23 +229,19 @@ async def voice(
                 pass
 
         # Transcribe with OpenAI
-        user_text = transcribe_audio_bytes(
-            data, filename=audio.filename or "audio.webm"
+        user_text = await asyncio.to_thread(
+            transcribe_audio_bytes, audio.file, filename=audio.filename or "audio.webm"
         )
         if not user_text:
             return JSONResponse({"error": "transcription failed"}, status_code=500)
 
         msgs.append({"role": "user", "content": user_text})
-        assistant_text = chat_complete(
+        assistant_text = await chat_complete(
             msgs, request.app.state.knowledge_base.vector_store_id
         )
 
         # Generate video via AvatarTalk
-        at_json: Dict[str, Any] = {}
-        try:
-            at_json = inference(assistant_text)
-        except Exception as e:
-            at_json = {"status": "error", "message": str(e)}
+        at_json = await inference_or_error(assistant_text)
 
         return JSONResponse(
             {
@@ -181,21 +256,24 @@ async def voice(
 
 @app.post("/transcribe", response_class=JSONResponse)
 async def transcribe(audio: UploadFile = File(...)) -> JSONResponse:
-    data = await audio.read()
-    if not data:
+    if not audio.size:
         return JSONResponse({"error": "empty audio"}, status_code=400)
     try:
-        text = transcribe_audio_bytes(data, filename=audio.filename or "audio.webm")
+        text = await asyncio.to_thread(
+            transcribe_audio_bytes, audio.file, filename=audio.filename or "audio.webm"
+        )
         return JSONResponse({"user_text": text})
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
 
 
-@app.post("/chat_stream", response_class=JSONResponse)
-async def chat_stream(request: Request, payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/chat_stream")
+async def chat_stream(request: Request, payload: Dict[str, Any]):
     """
-    Initialize a streaming video generation for assistant's reply.
-    Returns assistant_text and a stream_url to fetch the MP4 stream.
+    Generate the assistant's reply and return assistant_text and a stream_url
+    to fetch the MP4 stream from in a second request.
+    With CHAT_STREAM_DIRECT, instead streams the MP4 in the same response and
+    returns the reply text URL-encoded in the X-Assistant-Text header.
     """
     user_text = (payload or {}).get("user_text")
     history: List[Dict[str, str]] = (payload or {}).get("history") or []
@@ -208,23 +286,40 @@ async def chat_stream(request: Request, payload: Dict[str, Any]) -> JSONResponse
             messages.append({"role": msg["role"], "content": msg["content"]})
     messages.append({"role": "user", "content": user_text})
 
-    assistant_text = chat_complete(
-        messages, request.app.state.knowledge_base.vector_store_id
-    )
+    try:
+        assistant_text = await chat_complete(
+            messages, request.app.state.knowledge_base.vector_store_id
+        )
+    except ChatCompletionError as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
 
     # Optional overrides from payload
     avatar = (payload or {}).get("avatar") or settings.avatar
     emotion = (payload or {}).get("emotion") or settings.emotion
     language = (payload or {}).get("language") or settings.language
 
+    if settings.chat_stream_direct:
+        return video_stream_response(
+            request.app.state.http,
+            {
+                "text": assistant_text,
+                "avatar": avatar,
+                "emotion": emotion,
+                "language": language,
+            },
+            extra_headers=_assistant_text_headers(assistant_text),
+        )
+
     sid = str(uuid.uuid4())
+    expires_at = datetime.now(timezone.utc) + STREAM_TTL
     pending_streams[sid] = {
         "text": assistant_text,
         "avatar": avatar,
         "emotion": emotion,
         "language": language,
-        "expires_at": datetime.now(timezone.utc) + STREAM_TTL,
+        "expires_at": expires_at,
     }
+    heapq.heappush(_expiry_heap, (expires_at, sid))
     return JSONResponse(
         {
             "assistant_text": assistant_text,
@@ -235,7 +330,7 @@ async def chat_stream(request: Request, payload: Dict[str, Any]) -> JSONResponse
 
 
 @app.get("/stream/{sid}.mp4")
-def stream_video(sid: str):
+async def stream_video(request: Request, sid: str):
     info = pending_streams.pop(sid, None)
     if not info:
         return JSONResponse({"error": "invalid or expired stream id"}, status_code=404)
@@ -243,13 +338,40 @@ def stream_video(sid: str):
     if info.get("expires_at") and info["expires_at"] < datetime.now(timezone.utc):
         return JSONResponse({"error": "invalid or expired stream id"}, status_code=404)
 
-    text = info["text"]
-    payload = {
-        "text": text,
-        "avatar": info.get("avatar", settings.avatar),
-        "emotion": info.get("emotion", settings.emotion),
-        "language": info.get("language", settings.language),
-    }
+    return video_stream_response(
+        request.app.state.http,
+        {
+            "text": info["text"],
+            "avatar": info.get("avatar", settings.avatar),
+            "emotion": info.get("emotion", settings.emotion),
+            "language": info.get("language", settings.language),
+        },
+    )
+
+
+def _assistant_text_headers(text: str) -> Dict[str, str]:
+    """URL-encode the reply for a header, truncating it to MAX_TEXT_HEADER_LEN."""
+    encoded = quote(text)
+    if len(encoded) <= MAX_TEXT_HEADER_LEN:
+        return {"X-Assistant-Text": encoded}
+    # Cut on character boundaries so no percent-escape or UTF-8 sequence is split
+    parts: List[str] = []
+    size = 0
+    for ch in text:
+        enc = quote(ch)
+        if size + len(enc) > MAX_TEXT_HEADER_LEN:
+            break
+        parts.append(enc)
+        size += len(enc)
+    return {"X-Assistant-Text": "".join(parts), "X-Assistant-Text-Truncated": "true"}
+
+
+def video_stream_response(
+    http: httpx.AsyncClient,
+    payload: Dict[str, Any],
+    extra_headers: Dict[str, str] | None = None,
+) -> StreamingResponse:
+    """Proxy AvatarTalk's streaming /inference MP4 for the given payload."""
     base = settings.avatartalk_base_url.rstrip("/")
     url = f"{base}/inference?stream=true"
     headers = {
@@ -257,14 +379,11 @@ def stream_video(sid: str):
         "Content-Type": "application/json",
     }
 
-    def gen():
-        with requests.post(
-            url, json=payload, headers=headers, stream=True, timeout=None
-        ) as resp:
+    async def gen():
+        async with http.stream("POST", url, json=payload, headers=headers) as resp:
             resp.raise_for_status()
-            for chunk in resp.iter_content(chunk_size=16384):
-                if chunk:
-                    yield chunk
+            async for chunk in resp.aiter_bytes(65536):
+                yield chunk
 
     return StreamingResponse(
         gen(),
@@ -272,5 +391,6 @@ def stream_video(sid: str):
         headers={
             "Content-Disposition": "inline; filename=stream.mp4",
             "Cache-Control": "no-cache",
+            **(extra_headers or {}),
         },
     )
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict
 
 from .config import settings
 
 
+# Shared keep-alive session so repeated calls reuse pooled TCP/TLS connections
+session = requests.Session()
+session.mount(
+    "https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, pool_block=False)
+)
+
+
 class AvatarTalkError(RuntimeError):
     pass
 
@@ -41,7 +49,7 @@ def inference(
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    resp = requests.post(url, json=payload, headers=headers, timeout=60)
+    resp = session.post(url, json=payload, headers=headers, timeout=60)
     if resp.status_code >= 400:
         raise AvatarTalkError(
             f"AvatarTalk inference failed: {resp.status_code} {resp.text}"
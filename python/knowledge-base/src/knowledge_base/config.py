@@ -22,6 +22,7 @@ class Settings:
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     openai_stt_model: str = os.getenv("OPENAI_STT_MODEL", "whisper-1")
+    response_cache_size: int = int(os.getenv("OPENAI_RESPONSE_CACHE_SIZE", "1024"))
 
     # AvatarTalk
     avatartalk_api_key: str | None = os.getenv("AVATARTALK_API_KEY") or os.getenv("AT_API_KEY")
@@ -34,11 +35,13 @@ class Settings:
     emotion: str = os.getenv("AVATARTALK_EMOTION", "neutral")
     language: str = os.getenv("AVATARTALK_LANGUAGE", "en")
     delayed: bool = _get_bool("AVATARTALK_DELAYED", False)
+    pipeline_inference: bool = _get_bool("AVATARTALK_PIPELINE_INFERENCE", False)
 
     # Server config
     host: str = os.getenv("APP_HOST", "127.0.0.1")
     port: int = int(os.getenv("APP_PORT", "8000"))
     debug: bool = _get_bool("APP_DEBUG", True)
+    chat_stream_direct: bool = _get_bool("CHAT_STREAM_DIRECT", False)
 
 
 settings = Settings()
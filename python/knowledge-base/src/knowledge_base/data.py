@@ -1,36 +1,49 @@
 import argparse
-import concurrent
+import asyncio
+import logging
 import os
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+# Uploads are I/O-bound (two API calls per file), so allow far more in flight than CPU count
+MAX_CONCURRENT_UPLOADS = 32
+
 
 class KnowledgeBase:
     def __init__(self):
         self.openai_client = OpenAI(api_key=settings.openai_api_key)
+        self.async_openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
         self.vector_store_id = None
 
-    def upload_single_file_to_vector_store(self, file_path: os.PathLike, vector_store_id: str):
+    async def upload_single_file_to_vector_store(
+        self, file_path: os.PathLike, vector_store_id: str, semaphore: asyncio.Semaphore
+    ):
         file_name = os.path.basename(file_path)
 
-        try:
-            file_response = self.openai_client.files.create(
-                file=open(file_path, "rb"), purpose="assistants"
-            )
-            attach_response = self.openai_client.vector_stores.files.create(
-                vector_store_id=vector_store_id, file_id=file_response.id
-            )
-            return {"file": file_name, "status": "success"}
-        except Exception as e:
-            print(f"Error uploading file {file_name}: {e}")
-            return {"file": file_name, "status": "error", "error": str(e)}
+        async with semaphore:
+            try:
+                # Read in a worker thread so slow disks don't block the event loop
+                data = await asyncio.to_thread(Path(file_path).read_bytes)
+                file_response = await self.async_openai_client.files.create(
+                    file=(file_name, data), purpose="assistants"
+                )
+                attach_response = await self.async_openai_client.vector_stores.files.create(
+                    vector_store_id=vector_store_id, file_id=file_response.id
+                )
+                return {"file": file_name, "status": "success"}
+            except Exception as e:
+                logger.error("Error uploading file %s: %s", file_name, e)
+                return {"file": file_name, "status": "error", "error": str(e)}
 
-    def upload_directory_to_vector_store(self, directory_path: os.PathLike, vector_store_id: str):
-        files = [Path(directory_path) / Path(file) for file in os.listdir(directory_path)]
+    async def upload_directory_to_vector_store(self, directory_path: os.PathLike, vector_store_id: str):
+        # scandir's cached entry type lets us skip subdirectories without extra stat calls
+        with os.scandir(directory_path) as entries:
+            files = [Path(entry.path) for entry in entries if entry.is_file()]
         stats = {
             "total_files": len(files),
             "successful_uploads": 0,
@@ -38,18 +51,24 @@ class KnowledgeBase:
             "errors": []
         }
 
-        print(f"Uploading {stats['total_files']} files to vector store {vector_store_id}...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() - 1) as executor:
-            futures = {executor.submit(self.upload_single_file_to_vector_store, file_path, vector_store_id): file_path for file_path in files}
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                if result["status"] == "success":
-                    stats["successful_uploads"] += 1
-                    print(f"Uploaded file {result['file']}")
-                else:
-                    stats["failed_uploads"] += 1
-                    stats["errors"].append(result)
+        logger.info("Uploading %d files to vector store %s...", stats["total_files"], vector_store_id)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        tasks = [self.upload_single_file_to_vector_store(file_path, vector_store_id, semaphore) for file_path in files]
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            if result["status"] == "success":
+                stats["successful_uploads"] += 1
+                logger.debug("Uploaded file %s", result["file"])
+            else:
+                stats["failed_uploads"] += 1
+                stats["errors"].append(result)
 
+        logger.info(
+            "Uploaded %d of %d files (%d failed)",
+            stats["successful_uploads"],
+            stats["total_files"],
+            stats["failed_uploads"],
+        )
         return stats
 
     def create_vector_store(self, vector_store_name: str) -> dict[str, Any]:
@@ -61,28 +80,28 @@ class KnowledgeBase:
                 "created_at": vector_store.created_at,
                 "file_count": vector_store.file_counts.completed
             }
-            print(f"Vector store {vector_store_name} created successfully: {details}")
+            logger.info("Vector store %s created successfully: %s", vector_store_name, details)
             self.vector_store_id = details["id"]
 
             return details
         except Exception as e:
-            print(f"Error creating vector store {vector_store_name}: {e}")
+            logger.error("Error creating vector store %s: %s", vector_store_name, e)
             return {}
 
-    def create_and_initialize_vector_store(self, vector_store_name: str, directory_path: os.PathLike):
+    async def create_and_initialize_vector_store(self, vector_store_name: str, directory_path: os.PathLike):
         vector_store = self.create_vector_store(vector_store_name)
         if not vector_store:
             raise ValueError("Failed to create vector store")
 
-        stats = self.upload_directory_to_vector_store(directory_path, vector_store["id"])
+        stats = await self.upload_directory_to_vector_store(directory_path, vector_store["id"])
         return stats
 
     def shut_down_vector_store(self):
         if self.vector_store_id:
             try:
                 self.openai_client.vector_stores.delete(self.vector_store_id)
-                print(f"Vector store {self.vector_store_id} deleted successfully")
+                logger.info("Vector store %s deleted successfully", self.vector_store_id)
             except Exception as e:
-                print(f"Error deleting vector store {self.vector_store_id}: {e}")
+                logger.error("Error deleting vector store %s: %s", self.vector_store_id, e)
         else:
-            print("No vector store ID found")
+            logger.warning("No vector store ID found")
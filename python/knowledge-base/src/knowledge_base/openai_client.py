@@ -1,52 +1,184 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any
-from tempfile import NamedTemporaryFile
-from openai import OpenAI
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import IO, AsyncIterator, List, Dict, Any
+from openai import AsyncOpenAI, OpenAI
 
 from .config import settings
 
+# Sentence-ending punctuation followed by whitespace, so "3.14" isn't split mid-stream
+_SENTENCE_END_RE = re.compile(r"[.!?]+\s+")
 
+
+class ChatCompletionError(RuntimeError):
+    pass
+
+
+class _ResponseCache:
+    """Small thread-safe LRU for repeated transcriptions and first-turn answers."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        if self.maxsize <= 0 or not value:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_transcript_cache = _ResponseCache(settings.response_cache_size)
+_chat_cache = _ResponseCache(settings.response_cache_size)
+
+
+def _audio_digest(data: bytes | IO[bytes]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, bytes):
+        digest.update(data)
+    else:
+        for chunk in iter(lambda: data.read(65536), b""):
+            digest.update(chunk)
+        data.seek(0)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
 def build_openai_client() -> OpenAI:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
     return OpenAI(api_key=settings.openai_api_key)
 
 
-def chat_complete(
+@lru_cache(maxsize=1)
+def build_async_openai_client() -> AsyncOpenAI:
+    if not settings.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    return AsyncOpenAI(api_key=settings.openai_api_key)
+
+
+async def chat_complete_stream(
     messages: List[Dict[str, Any]],
     vector_store_id: str,
     model: str | None = None,
-) -> str:
-    client = build_openai_client()
+) -> AsyncIterator[str]:
+    """
+    Stream the assistant's reply as text deltas without blocking the event loop.
+    Raises ChatCompletionError if the response fails or ends incomplete.
+    """
+    client = build_async_openai_client()
 
     mdl = model or settings.openai_model
-    resp = client.responses.create(
+    stream = await client.responses.create(
         model=mdl,
         input=messages,
         temperature=0.7,
         tools=[{"type": "file_search", "vector_store_ids": [vector_store_id]}],
+        stream=True,
     )
+    async for event in stream:
+        if event.type == "response.output_text.delta":
+            yield event.delta
+        elif event.type == "response.failed":
+            error = event.response.error
+            raise ChatCompletionError(
+                f"OpenAI response failed: {error.message if error else 'unknown error'}"
+            )
+        elif event.type == "response.incomplete":
+            details = event.response.incomplete_details
+            raise ChatCompletionError(
+                f"OpenAI response incomplete: {details.reason if details else 'unknown'}"
+            )
+        elif event.type == "error":
+            raise ChatCompletionError(f"OpenAI stream error: {event.message}")
 
-    return resp.output[1].content[0].text
+
+async def chat_complete(
+    messages: List[Dict[str, Any]],
+    vector_store_id: str,
+    model: str | None = None,
+) -> str:
+    # Only history-free turns are cached; with history the answer depends on context
+    key = None
+    if len(messages) == 1:
+        key = hashlib.blake2b(
+            json.dumps(
+                [messages, model or settings.openai_model, vector_store_id],
+                sort_keys=True,
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached = _chat_cache.get(key)
+        if cached is not None:
+            return cached
+
+    parts = [
+        delta async for delta in chat_complete_stream(messages, vector_store_id, model)
+    ]
+    text = "".join(parts)
+    if key is not None:
+        _chat_cache.put(key, text)
+    return text
+
+
+async def chat_complete_sentences(
+    messages: List[Dict[str, Any]],
+    vector_store_id: str,
+    model: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream the assistant's reply as complete sentences, as soon as each one ends.
+    """
+    buffer = ""
+    async for delta in chat_complete_stream(messages, vector_store_id, model):
+        buffer += delta
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(buffer):
+            sentence = buffer[start : match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+
+    if buffer.strip():
+        yield buffer.strip()
 
 
 def transcribe_audio_bytes(
-    data: bytes, filename: str = "audio.webm", model: str | None = None
+    data: bytes | IO[bytes], filename: str = "audio.webm", model: str | None = None
 ) -> str:
     client = build_openai_client()
     mdl = model or settings.openai_stt_model
-    # Use a temporary file to ensure the SDK includes filename and content-type correctly
-    with NamedTemporaryFile(
-        suffix=filename[filename.rfind(".") :] if "." in filename else ".webm"
-    ) as tmp:
-        tmp.write(data)
-        tmp.flush()
-        with open(tmp.name, "rb") as f:
-            tr = client.audio.transcriptions.create(
-                model=mdl,
-                file=f,
-            )
+    key = f"{mdl}:{_audio_digest(data)}"
+    cached = _transcript_cache.get(key)
+    if cached is not None:
+        return cached
+    # The SDK takes the filename (and so the content-type) from the tuple, and
+    # streams file-like data without copying it into a temporary file first
+    if "." not in filename:
+        filename += ".webm"
+    tr = client.audio.transcriptions.create(
+        model=mdl,
+        file=(filename, data),
+    )
     # The response has .text for Whisper-like models
     # For newer models, the SDK still returns `.text` consistently
-    return getattr(tr, "text", "") or ""
+    text = getattr(tr, "text", "") or ""
+    _transcript_cache.put(key, text)
+    return text
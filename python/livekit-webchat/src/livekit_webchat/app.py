@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
 import traceback
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, Coroutine, Dict, List, Set, Tuple
 import json
 import uuid
 from pathlib import Path
@@ -11,13 +14,45 @@ from fastapi import FastAPI, Request, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 
-from urllib.parse import quote
-from websockets.sync.client import connect
+from urllib.parse import quote, urlencode
+from websockets.asyncio.client import ClientConnection, connect as ws_connect
+from websockets.exceptions import ConnectionClosed
 from .config import settings
 from .openai_client import chat_complete, transcribe_audio_bytes
 
 
-app = FastAPI(title="AvatarTalk · LiveKit WebChat")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The page only depends on frozen settings, so render it once up front
+    app.state.index_html = _render_index()
+    # One LiveKit API client for the whole process so room creation reuses
+    # its pooled connection instead of paying a TLS handshake per session
+    app.state.lkapi = None
+    if settings.livekit_url:
+        from livekit import api as lk_api
+
+        try:
+            app.state.lkapi = lk_api.LiveKitAPI(
+                url=settings.livekit_url,
+                api_key=settings.livekit_api_key,
+                api_secret=settings.livekit_api_secret,
+            )
+        except Exception:
+            # Missing credentials: sessions will fail on token minting anyway
+            pass
+    # Expire sessions in the background instead of scanning on every request
+    sweeper = asyncio.create_task(_sweep_sessions())
+    yield
+    sweeper.cancel()
+    await asyncio.gather(
+        *(_close_avatar_ws(s) for s in sessions.values() if s.get("ws")),
+        return_exceptions=True,
+    )
+    if app.state.lkapi is not None:
+        await app.state.lkapi.aclose()
+
+
+app = FastAPI(title="AvatarTalk · LiveKit WebChat", lifespan=lifespan)
 
 TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
@@ -30,12 +65,23 @@ class SessionInfo(Dict[str, Any]):
 
 sessions: Dict[str, SessionInfo] = {}
 SESSION_TTL = timedelta(hours=6)
+# (expires_at, session_id) min-heap so cleanup only touches sessions that are due
+_expiry_heap: List[Tuple[datetime, str]] = []
+# Strong references to fire-and-forget tasks so they aren't collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
 
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _spawn(coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
 def _mint_livekit_token(
     *,
     identity: str,
@@ -63,23 +109,27 @@ def healthz() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+def _render_index() -> str:
+    return templates.get_template("index.html").render(
+        model=settings.openai_model,
+        avatar=settings.avatar,
+        emotion=settings.emotion,
+        language=settings.language,
+        livekit_url=settings.livekit_url or "",
+    )
+
+
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request) -> HTMLResponse:
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "model": settings.openai_model,
-            "avatar": settings.avatar,
-            "emotion": settings.emotion,
-            "language": settings.language,
-            "livekit_url": settings.livekit_url or "",
-        },
-    )
+    # In debug mode re-render so template edits show up without a restart
+    html = _render_index() if settings.debug else request.app.state.index_html
+    return HTMLResponse(html)
 
 
 @app.post("/session", response_class=JSONResponse)
-async def create_session(payload: Dict[str, Any] | None = None) -> JSONResponse:
+async def create_session(
+    request: Request, payload: Dict[str, Any] | None = None
+) -> JSONResponse:
     if not settings.livekit_url:
         return JSONResponse({"error": "LIVEKIT_URL is not set"}, status_code=500)
     # One room per session
@@ -88,16 +138,11 @@ async def create_session(payload: Dict[str, Any] | None = None) -> JSONResponse:
     user_identity = f"user-{session_id[:8]}"
     avatar_identity = f"avatar-{session_id[:8]}"
     # Optionally create the room up-front for clarity
+    lkapi = request.app.state.lkapi
     try:
         from livekit import api as lk_api
 
-        lkapi = lk_api.LiveKitAPI(
-            url=settings.livekit_url,
-            api_key=settings.livekit_api_key,
-            api_secret=settings.livekit_api_secret,
-        )
         await lkapi.room.create_room(lk_api.CreateRoomRequest(name=room_name))
-        await lkapi.aclose()
     except Exception:
         # If room already exists or server auto-creates on join, ignore
         pass
@@ -117,14 +162,18 @@ async def create_session(payload: Dict[str, Any] | None = None) -> JSONResponse:
         can_subscribe=False,
     )
 
+    created_at = _now()
+    expires_at = created_at + SESSION_TTL
     sessions[session_id] = SessionInfo(
         {
             "room": room_name,
             "avatar_token": avatar_token,
-            "created_at": _now(),
-            "expires_at": _now() + SESSION_TTL,
+            "ws_lock": asyncio.Lock(),
+            "created_at": created_at,
+            "expires_at": expires_at,
         }
     )
+    heapq.heappush(_expiry_heap, (expires_at, session_id))
     return JSONResponse(
         {
             "session_id": session_id,
@@ -137,38 +186,151 @@ async def create_session(payload: Dict[str, Any] | None = None) -> JSONResponse:
 
 def _cleanup_sessions() -> None:
     now = _now()
-    expired = [
-        sid
-        for sid, s in sessions.items()
-        if s.get("expires_at") and s["expires_at"] < now
-    ]
-    for sid in expired:
-        sessions.pop(sid, None)
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        _, sid = heapq.heappop(_expiry_heap)
+        session = sessions.pop(sid, None)
+        if session and session.get("ws"):
+            _spawn(_close_avatar_ws(session))
 
 
-def _send_text_to_avatar_via_ws(
+async def _sweep_sessions() -> None:
+    while True:
+        _cleanup_sessions()
+        # Every session gets the same TTL, so nothing created meanwhile expires sooner
+        delay = _expiry_heap[0][0] - _now() if _expiry_heap else SESSION_TTL
+        await asyncio.sleep(max(delay.total_seconds(), 0))
+
+
+def _get_session(session_id: str | None) -> SessionInfo | None:
+    # Sessions past their TTL are rejected here even before the sweeper drops them
+    session = sessions.get(session_id) if session_id else None
+    if session is None or session["expires_at"] < _now():
+        return None
+    return session
+
+
+# Fixed parts of the /ws/infer URLs, built once since settings are frozen
+_AVATARTALK_WS_INFER = f"{settings.avatartalk_base_url.rstrip('/')}/ws/infer"
+_TEXT_INFER_PREFIX = f"{_AVATARTALK_WS_INFER}?output_type=livekit&input_type=text"
+_AUDIO_INFER_PREFIX = f"{_AVATARTALK_WS_INFER}?output_type=livekit&input_type=audio"
+_LIVEKIT_URL_QS = f"&livekit_url={settings.livekit_url}"
+# Form/query values accepted as "on" for increase_resolution
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+_AUTH_HEADERS = [("Authorization", f"Bearer {settings.avatartalk_api_key}")]
+# Sentinel that tells AvatarTalk to finish the stream
+_CLOSE = b"!!!Close!!!"
+
+
+def _avatar_ws_url(
     *,
     meeting_token: str,
+    avatar: str,
+    emotion: str,
+    language: str,
+    increase_resolution: bool,
+) -> str:
+    # Pass all required params in query string; authenticate via Authorization header
+    params = {
+        "avatar": avatar,
+        "emotion": emotion,
+        "language": language,
+        "meeting_token": meeting_token,
+        "increase_resolution": "true" if increase_resolution else "false",
+    }
+    return f"{_TEXT_INFER_PREFIX}&{urlencode(params, quote_via=quote)}{_LIVEKIT_URL_QS}"
+
+
+async def _drain_avatar_ws(ws: ClientConnection) -> None:
+    # Read (and ignore) upstream status frames so the connection stays responsive
+    try:
+        async for _ in ws:
+            pass
+    except Exception:
+        pass
+
+
+async def _connect_avatar_ws(session: SessionInfo, url: str) -> ClientConnection:
+    ws = await ws_connect(url, additional_headers=_AUTH_HEADERS, open_timeout=30)
+    session["ws"] = ws
+    session["ws_url"] = url
+    session["ws_drain"] = asyncio.create_task(_drain_avatar_ws(ws))
+    return ws
+
+
+async def _close_avatar_ws(session: SessionInfo) -> None:
+    ws = session.pop("ws", None)
+    drain = session.pop("ws_drain", None)
+    session.pop("ws_url", None)
+    if ws is None:
+        return
+    try:
+        await ws.send(_CLOSE)
+        await ws.close()
+    except Exception:
+        pass
+    if drain:
+        drain.cancel()
+
+
+async def _ensure_avatar_ws(session: SessionInfo, url: str) -> ClientConnection:
+    # Callers hold session["ws_lock"]
+    ws = session.get("ws")
+    if ws is not None and session.get("ws_url") != url:
+        await _close_avatar_ws(session)
+        ws = None
+    if ws is None:
+        ws = await _connect_avatar_ws(session, url)
+    return ws
+
+
+async def _preconnect_avatar_ws(session: SessionInfo, **params: Any) -> None:
+    url = _avatar_ws_url(meeting_token=session["avatar_token"], **params)
+    async with session["ws_lock"]:
+        await _ensure_avatar_ws(session, url)
+
+
+def _start_avatar_preconnect(session: SessionInfo, **params: Any) -> None:
+    """
+    Open the avatar connection in the background so the handshake overlaps
+    with STT and the LLM call. The send later waits on the same lock, and a
+    failed preconnect is retried (and reported) by the send itself.
+    """
+    if not settings.avatartalk_api_key:
+        return
+    task = _spawn(_preconnect_avatar_ws(session, **params))
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _send_text_to_avatar_via_ws(
+    *,
+    session: SessionInfo,
     text: str,
     avatar: str,
     emotion: str,
     language: str,
     increase_resolution: bool,
 ) -> None:
-    base = settings.avatartalk_base_url.rstrip("/")
-    # Pass all required params in query string; authenticate via Authorization header
-    qs = (
-        f"output_type=livekit&input_type=text&avatar={quote(avatar)}"
-        f"&emotion={quote(emotion)}&language={quote(language)}"
-        f"&meeting_token={quote(meeting_token)}"
-        f"&increase_resolution={'true' if increase_resolution else 'false'}"
-        f"&livekit_url={settings.livekit_url}"
+    """
+    Send one turn of text over the session's persistent /ws/infer connection,
+    opening it on first use and reopening it if the avatar settings change.
+    """
+    url = _avatar_ws_url(
+        meeting_token=session["avatar_token"],
+        avatar=avatar,
+        emotion=emotion,
+        language=language,
+        increase_resolution=increase_resolution,
     )
-    url = f"{base}/ws/infer?{qs}"
-    headers = {"Authorization": f"Bearer {settings.avatartalk_api_key}"}
-    with connect(url, additional_headers=headers, timeout=30) as ws:
-        ws.send(text.encode("utf-8"))
-        ws.send(b"!!!Close!!!")
+    data = text.encode("utf-8")
+    async with session["ws_lock"]:
+        ws = await _ensure_avatar_ws(session, url)
+        try:
+            await ws.send(data)
+        except ConnectionClosed:
+            # The idle connection was dropped upstream; reconnect once
+            await _close_avatar_ws(session)
+            ws = await _connect_avatar_ws(session, url)
+            await ws.send(data)
 
 
 @app.post("/chat", response_class=JSONResponse)
@@ -177,13 +339,13 @@ async def chat(payload: Dict[str, Any]) -> JSONResponse:
     Accepts: {session_id, user_text, history?, avatar?, emotion?, language?, increase_resolution?}
     Returns: {assistant_text}
     """
-    _cleanup_sessions()
-    user_text = (payload or {}).get("user_text")
-    session_id = (payload or {}).get("session_id")
-    history: List[Dict[str, str]] = (payload or {}).get("history") or []
+    p = payload or {}
+    user_text = p.get("user_text")
+    session = _get_session(p.get("session_id"))
+    history: List[Dict[str, str]] = p.get("history") or []
     if not user_text:
         return JSONResponse({"error": "user_text is required"}, status_code=400)
-    if not session_id or session_id not in sessions:
+    if session is None:
         return JSONResponse({"error": "invalid session_id"}, status_code=400)
 
     messages: List[Dict[str, str]] = []
@@ -192,20 +354,26 @@ async def chat(payload: Dict[str, Any]) -> JSONResponse:
             messages.append({"role": msg["role"], "content": msg["content"]})
     messages.append({"role": "user", "content": user_text})
 
-    assistant_text = chat_complete(messages)
-
-    avatar = (payload or {}).get("avatar") or settings.avatar
-    emotion = (payload or {}).get("emotion") or settings.emotion
-    language = (payload or {}).get("language") or settings.language
-    increase_resolution = bool((payload or {}).get("increase_resolution"))
+    avatar = p.get("avatar") or settings.avatar
+    emotion = p.get("emotion") or settings.emotion
+    language = p.get("language") or settings.language
+    increase_resolution = bool(p.get("increase_resolution"))
+
+    _start_avatar_preconnect(
+        session,
+        avatar=avatar,
+        emotion=emotion,
+        language=language,
+        increase_resolution=increase_resolution,
+    )
+    assistant_text = await chat_complete(messages)
 
     if not settings.avatartalk_api_key:
         return JSONResponse({"error": "AVATARTALK_API_KEY is not set"}, status_code=500)
 
-    meeting_token = sessions[session_id]["avatar_token"]
     try:
-        _send_text_to_avatar_via_ws(
-            meeting_token=meeting_token,
+        await _send_text_to_avatar_via_ws(
+            session=session,
             text=assistant_text,
             avatar=avatar,
             emotion=emotion,
@@ -232,13 +400,26 @@ async def voice(
     language: str | None = Form(None),
     increase_resolution: str | None = Form(None),
 ) -> JSONResponse:
-    _cleanup_sessions()
-    if not session_id or session_id not in sessions:
+    session = _get_session(session_id)
+    if session is None:
         return JSONResponse({"error": "invalid session_id"}, status_code=400)
     try:
-        data = await audio.read()
-        if not data:
+        # UploadFile is already spooled, so hand its file over instead of reading it
+        if not audio.size:
             return JSONResponse({"error": "empty audio"}, status_code=400)
+
+        avatar_v = avatar or settings.avatar
+        emotion_v = emotion or settings.emotion
+        language_v = language or settings.language
+        inc_res = (increase_resolution or "").lower() in _TRUTHY
+        _start_avatar_preconnect(
+            session,
+            avatar=avatar_v,
+            emotion=emotion_v,
+            language=language_v,
+            increase_resolution=inc_res,
+        )
+
         msgs: List[Dict[str, str]] = []
         if history:
             try:
@@ -250,27 +431,21 @@ async def voice(
                         msgs.append({"role": msg["role"], "content": msg["content"]})
             except Exception:
                 pass
-        user_text = transcribe_audio_bytes(
-            data, filename=audio.filename or "audio.webm"
+        user_text = await transcribe_audio_bytes(
+            audio.file, filename=audio.filename or "audio.webm"
         )
         if not user_text:
             return JSONResponse({"error": "transcription failed"}, status_code=500)
         msgs.append({"role": "user", "content": user_text})
-        assistant_text = chat_complete(msgs)
-
-        avatar_v = avatar or settings.avatar
-        emotion_v = emotion or settings.emotion
-        language_v = language or settings.language
-        inc_res = (increase_resolution or "").lower() in {"1", "true", "yes", "on"}
+        assistant_text = await chat_complete(msgs)
 
         if not settings.avatartalk_api_key:
             return JSONResponse(
                 {"error": "AVATARTALK_API_KEY is not set"}, status_code=500
             )
-        meeting_token = sessions[session_id]["avatar_token"]
         try:
-            _send_text_to_avatar_via_ws(
-                meeting_token=meeting_token,
+            await _send_text_to_avatar_via_ws(
+                session=session,
                 text=assistant_text,
                 avatar=avatar_v,
                 emotion=emotion_v,
@@ -298,11 +473,12 @@ async def voice(
 
 @app.post("/transcribe", response_class=JSONResponse)
 async def transcribe(audio: UploadFile = File(...)) -> JSONResponse:
-    data = await audio.read()
-    if not data:
+    if not audio.size:
         return JSONResponse({"error": "empty audio"}, status_code=400)
     try:
-        text = transcribe_audio_bytes(data, filename=audio.filename or "audio.webm")
+        text = await transcribe_audio_bytes(
+            audio.file, filename=audio.filename or "audio.webm"
+        )
         return JSONResponse({"user_text": text})
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
@@ -310,8 +486,6 @@ async def transcribe(audio: UploadFile = File(...)) -> JSONResponse:
 
 # WebSocket audio relay: browser -> server -> AvatarTalk /ws/infer (audio input)
 from fastapi import WebSocket, WebSocketDisconnect
-import asyncio
-import websockets
 
 
 @app.websocket("/ws/audio")
@@ -325,33 +499,33 @@ async def ws_audio(
 ):
     await websocket.accept()
     try:
-        _cleanup_sessions()
-        if session_id not in sessions:
+        session = _get_session(session_id)
+        if session is None:
             await websocket.close(code=4000)
             return
         if not settings.avatartalk_api_key:
             await websocket.close(code=4001)
             return
-        meeting_token = sessions[session_id]["avatar_token"]
-        inc_res = str(increase_resolution).lower() in {"1", "true", "yes", "on"}
-        base = settings.avatartalk_base_url.rstrip("/")
-        qs = (
-            f"output_type=livekit&input_type=audio&avatar={quote(avatar or settings.avatar)}"
-            f"&emotion={quote(emotion or settings.emotion)}&language={quote(language or settings.language)}"
-            f"&meeting_token={quote(meeting_token)}"
-            f"&increase_resolution={'true' if inc_res else 'false'}"
-        )
-        up_url = f"{base}/ws/infer?{qs}"
+        meeting_token = session["avatar_token"]
+        inc_res = str(increase_resolution).lower() in _TRUTHY
+        params = {
+            "avatar": avatar or settings.avatar,
+            "emotion": emotion or settings.emotion,
+            "language": language or settings.language,
+            "meeting_token": meeting_token,
+            "increase_resolution": "true" if inc_res else "false",
+        }
+        up_url = f"{_AUDIO_INFER_PREFIX}&{urlencode(params, quote_via=quote)}"
 
-        async with websockets.connect(
+        async with ws_connect(
             up_url,
-            extra_headers=[("Authorization", f"Bearer {settings.avatartalk_api_key}")],
+            additional_headers=_AUTH_HEADERS,
             max_size=None,
+            write_limit=2 * 1024 * 1024,
         ) as upstream:
             # Relay browser binary frames to upstream
             async def from_client_to_upstream():
-                while True:
-                    data = await websocket.receive_bytes()
+                async for data in websocket.iter_bytes():
                     await upstream.send(data)
 
             # Optionally read upstream to keep connection healthy
@@ -365,11 +539,23 @@ async def ws_audio(
 
             t1 = asyncio.create_task(from_client_to_upstream())
             t2 = asyncio.create_task(from_upstream_to_client())
+            # Either side finishing (browser disconnect or upstream close) ends the relay
             done, pending = await asyncio.wait(
-                {t1, t2}, return_when=asyncio.FIRST_EXCEPTION
+                {t1, t2}, return_when=asyncio.FIRST_COMPLETED
             )
             for t in pending:
                 t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for t in done:
+                exc = None if t.cancelled() else t.exception()
+                if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                    print(
+                        "".join(
+                            traceback.format_exception(
+                                type(exc), exc, exc.__traceback__
+                            )
+                        )
+                    )
     except WebSocketDisconnect:
         pass
     except Exception:
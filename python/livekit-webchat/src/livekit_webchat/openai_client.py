@@ -1,27 +1,28 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any
-import io
-from tempfile import NamedTemporaryFile
-from openai import OpenAI
+from functools import lru_cache
+from typing import IO, List, Dict, Any
+from openai import AsyncOpenAI
 
 from .config import settings
 
 
-def build_openai_client() -> OpenAI:
+# Reuse one client, and with it one connection pool, for the whole process
+@lru_cache(maxsize=1)
+def build_async_openai_client() -> AsyncOpenAI:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=settings.openai_api_key)
+    return AsyncOpenAI(api_key=settings.openai_api_key)
 
 
-def chat_complete(
+async def chat_complete(
     messages: List[Dict[str, Any]],
     model: str | None = None,
 ) -> str:
-    client = build_openai_client()
+    client = build_async_openai_client()
     mdl = model or settings.openai_model
     # Use Chat Completions for simplicity
-    resp = client.chat.completions.create(
+    resp = await client.chat.completions.create(
         model=mdl,
         messages=messages,
         temperature=0.7,
@@ -30,18 +31,17 @@ def chat_complete(
     return choice.message.content or ""
 
 
-def transcribe_audio_bytes(data: bytes, filename: str = "audio.webm", model: str | None = None) -> str:
-    client = build_openai_client()
+async def transcribe_audio_bytes(data: bytes | IO[bytes], filename: str = "audio.webm", model: str | None = None) -> str:
+    client = build_async_openai_client()
     mdl = model or settings.openai_stt_model
-    # Use a temporary file to ensure the SDK includes filename and content-type correctly
-    with NamedTemporaryFile(suffix=filename[filename.rfind("."): ] if "." in filename else ".webm") as tmp:
-        tmp.write(data)
-        tmp.flush()
-        with open(tmp.name, "rb") as f:
-            tr = client.audio.transcriptions.create(
-                model=mdl,
-                file=f,
-            )
+    # The SDK takes the filename (and so the content-type) from the tuple, and
+    # sends bytes or a file-like object as is, without a temporary file
+    if "." not in filename:
+        filename += ".webm"
+    tr = await client.audio.transcriptions.create(
+        model=mdl,
+        file=(filename, data),
+    )
     # The response has .text for Whisper-like models
     # For newer models, the SDK still returns `.text` consistently
     return getattr(tr, "text", "") or ""
@@ -14,7 +14,7 @@ from fastapi.staticfiles import StaticFiles
 
 from .config import settings
 from .openai_client import chat_complete, transcribe_audio_bytes
-from .avatartalk_client import inference, AvatarTalkError
+from .avatartalk_client import inference, AvatarTalkError, aclose_client
 
 
 app = FastAPI(title="AvatarTalk Simple WebChat")
@@ -49,6 +49,7 @@ async def _stop_janitor() -> None:
     task = getattr(app.state, "_janitor_task", None)
     if task:
         task.cancel()
+    await aclose_client()
 
 
 @app.get("/healthz")
@@ -99,7 +100,7 @@ async def chat(payload: Dict[str, Any]) -> JSONResponse:
     # Generate video via AvatarTalk /inference for the assistant's text
     at_json: Dict[str, Any] = {}
     try:
-        at_json = inference(
+        at_json = await inference(
             assistant_text,
             avatar=avatar,
             emotion=emotion,
@@ -146,7 +147,7 @@ async def voice(
         # Generate video via AvatarTalk
         at_json: Dict[str, Any] = {}
         try:
-            at_json = inference(assistant_text)
+            at_json = await inference(assistant_text)
         except Exception as e:
             at_json = {"status": "error", "message": str(e)}
 
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-import requests
+import httpx
 from typing import Any, Dict
 
 from .config import settings
 
+# Shared across requests so calls reuse pooled keep-alive connections
+_client = httpx.AsyncClient(
+    base_url=settings.avatartalk_base_url.rstrip("/"),
+    timeout=60.0,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+)
+
 
 class AvatarTalkError(RuntimeError):
     pass
 
 
-def inference(
+async def inference(
     text: str,
     *,
     avatar: str | None = None,
@@ -24,8 +31,6 @@ def inference(
     if not settings.avatartalk_api_key:
         raise RuntimeError("AVATARTALK_API_KEY is not set")
 
-    base = settings.avatartalk_base_url.rstrip("/")
-    url = f"{base}/inference"
     payload = {
         "text": text,
         "avatar": avatar or settings.avatar,
@@ -41,9 +46,13 @@ def inference(
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    resp = requests.post(url, json=payload, headers=headers, timeout=60)
+    resp = await _client.post("/inference", json=payload, headers=headers)
     if resp.status_code >= 400:
         raise AvatarTalkError(
             f"AvatarTalk inference failed: {resp.status_code} {resp.text}"
         )
     return resp.json()
+
+
+async def aclose_client() -> None:
+    await _client.aclose()
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, Dict, Any
-import io
-from tempfile import NamedTemporaryFile
 from openai import OpenAI
 
 from .config import settings
 
 
+# Reuse one client, and with it one connection pool, for the whole process
+@lru_cache(maxsize=1)
 def build_openai_client() -> OpenAI:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
@@ -33,15 +34,14 @@ def chat_complete(
 def transcribe_audio_bytes(data: bytes, filename: str = "audio.webm", model: str | None = None) -> str:
     client = build_openai_client()
     mdl = model or settings.openai_stt_model
-    # Use a temporary file to ensure the SDK includes filename and content-type correctly
-    with NamedTemporaryFile(suffix=filename[filename.rfind("."): ] if "." in filename else ".webm") as tmp:
-        tmp.write(data)
-        tmp.flush()
-        with open(tmp.name, "rb") as f:
-            tr = client.audio.transcriptions.create(
-                model=mdl,
-                file=f,
-            )
+    # The SDK takes the filename (and so the content-type) from the tuple,
+    # so the audio can be sent from memory without a temporary file
+    if "." not in filename:
+        filename += ".webm"
+    tr = client.audio.transcriptions.create(
+        model=mdl,
+        file=(filename, data),
+    )
     # The response has .text for Whisper-like models
     # For newer models, the SDK still returns `.text` consistently
     return getattr(tr, "text", "") or ""
@@ -7,6 +7,13 @@ import websockets
 from websockets.exceptions import ConnectionClosed, ConnectionClosedOK
 
 DEFAULT_API_URL = "wss://api.avatartalk.ai"
+# Let websockets detect dead connections instead of polling recv() with timeouts
+PING_INTERVAL = 20
+PING_TIMEOUT = 20
+# Sentinel that tells AvatarTalk to finish the stream
+_CLOSE = b"!!!Close!!!"
+# How long coalesced sends are buffered before going out as one frame
+COALESCE_INTERVAL = 0.02
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +32,8 @@ class AvatarTalkConnector:
         max_reconnect_attempts: int = 5,
         initial_backoff: float = 1.0,
         max_backoff: float = 30.0,
+        *,
+        coalesce: bool = False,
     ):
         self.avatar = avatar
         self.emotion = "neutral"
@@ -32,6 +41,7 @@ class AvatarTalkConnector:
         self.room_name = "avatartalk-live"
         self.api_url = url or DEFAULT_API_URL
         self.api_key = api_key
+        self._headers = {"Authorization": f"Bearer {api_key}"}
         if not rtmp_url or not stream_key:
             raise ValueError("YOUTUBE_RTMP_URL and YOUTUBE_STREAM_KEY are required for RTMP output")
         self.url = (
@@ -56,8 +66,24 @@ class AvatarTalkConnector:
         self.max_backoff = max_backoff
         self._is_reconnecting = False
 
+        # Optional send coalescing: small fragments (e.g. streamed LLM tokens)
+        # are buffered and written as one frame every COALESCE_INTERVAL
+        self.coalesce = coalesce
+        self._buf: list[bytes] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        # A background flush failure is kept and re-raised from the next send()/flush()
+        self._flush_error: Exception | None = None
+
+    async def _connect(self) -> websockets.ClientConnection:
+        return await websockets.connect(
+            self.url,
+            additional_headers=self._headers,
+            ping_interval=PING_INTERVAL,
+            ping_timeout=PING_TIMEOUT,
+        )
+
     async def initialize(self) -> None:
-        self._ws = await websockets.connect(self.url, additional_headers={"Authorization": f"Bearer {self.api_key}"})
+        self._ws = await self._connect()
 
     async def _reconnect(self) -> bool:
         """
@@ -92,7 +118,7 @@ class AvatarTalkConnector:
                         self._ws = None
 
                 # Try to reconnect
-                self._ws = await websockets.connect(self.url, additional_headers={"Authorization": f"Bearer {self.api_key}"})
+                self._ws = await self._connect()
                 logger.info("Successfully reconnected to AvatarTalk websocket")
                 self._is_reconnecting = False
                 return True
@@ -110,34 +136,62 @@ class AvatarTalkConnector:
         self._is_reconnecting = False
         return False
 
-    async def send(self, text_content: str) -> None:
+    async def _send_bytes(self, data: bytes) -> None:
         try:
             if not self._ws:
                 raise RuntimeError("WebSocket connection is not initialized")
-            await self._ws.send(text_content.encode("utf-8"))
+            await self._ws.send(data)
         except (ConnectionClosed, ConnectionClosedOK) as e:
             logger.warning("WebSocket connection closed during send: %s", e)
             # Attempt to reconnect
             if await self._reconnect():
                 # Retry the send after successful reconnection
-                await self._ws.send(text_content.encode("utf-8"))
+                await self._ws.send(data)
             else:
                 raise RuntimeError("Failed to reconnect to websocket") from e
         except Exception as e:
             logger.exception("Error sending message: %s", e)
             raise
 
+    async def send(self, text_content: str) -> None:
+        data = text_content.encode("utf-8")
+        if not self.coalesce:
+            await self._send_bytes(data)
+            return
+        self._raise_flush_error()
+        self._buf.append(data)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(COALESCE_INTERVAL)
+        try:
+            await self.flush()
+        except Exception as e:
+            self._flush_error = e
+
+    def _raise_flush_error(self) -> None:
+        if self._flush_error is not None:
+            error, self._flush_error = self._flush_error, None
+            raise error
+
+    async def flush(self) -> None:
+        """Send any buffered fragments now as a single frame."""
+        self._raise_flush_error()
+        if not self._buf:
+            return
+        data = b"".join(self._buf)
+        self._buf.clear()
+        await self._send_bytes(data)
+
     async def receive(self) -> dict[str, Any]:
         while True:
             try:
                 if not self._ws:
                     raise RuntimeError("WebSocket connection is not initialized")
-                raw = await asyncio.wait_for(self._ws.recv(), timeout=5)
+                # A missed pong surfaces here as ConnectionClosed
+                raw = await self._ws.recv()
                 return json.loads(raw)
-            except TimeoutError:
-                logger.debug("No message received in 5 seconds, retrying...")
-                await asyncio.sleep(5)
-                continue
             except (ConnectionClosed, ConnectionClosedOK) as e:
                 logger.warning("WebSocket connection closed during receive: %s", e)
                 # Attempt to reconnect
@@ -153,6 +207,10 @@ class AvatarTalkConnector:
         if not self._ws:
             return
         try:
-            await self.send("!!!Close!!!")
+            if self._flush_task is not None:
+                # Let a scheduled flush finish rather than cutting it off mid-send
+                await self._flush_task
+            await self.flush()
+            await self._ws.send(_CLOSE)
         finally:
             await self._ws.close()
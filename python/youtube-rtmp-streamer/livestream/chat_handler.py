@@ -4,14 +4,41 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI
+from openai import APIError, AsyncOpenAI
 
+from livestream.config import MAX_COMMENT_CHARS
 from livestream.context_store import ChatMessage, GlobalContextStore
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single chat completion so a stalled request can't pin the handler
+RESPONSE_TIMEOUT_SECONDS = 15
+
+CHAT_PROMPT_PATH = "chat.prompt"
+
+# Comment backlog and worker pool size; bounds concurrent OpenAI calls during bursts
+COMMENT_QUEUE_SIZE = 64
+COMMENT_QUEUE_PUT_TIMEOUT = 30.0
+CHAT_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
+def _load_chat_prompt_template() -> str:
+    with open(CHAT_PROMPT_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=8)
+def _build_chat_prompt(language: str) -> str:
+    """Render the chat prompt for a language; the template file is read only once."""
+    return _load_chat_prompt_template().replace("{language}", language)
+
 
 class ChatHandler:
     """
@@ -23,7 +50,7 @@ class ChatHandler:
 
     def __init__(
         self,
-        openai_client: OpenAI,
+        openai_client: AsyncOpenAI,
         model: str,
         context_store: GlobalContextStore,
         system_prompt: str | None = None,
@@ -33,7 +60,7 @@ class ChatHandler:
         Initialize the chat handler.
 
         Args:
-            openai_client: OpenAI client instance
+            openai_client: Async OpenAI client instance
             model: Model to use for chat responses
             context_store: Global context store for chat history
             system_prompt: Optional custom system prompt for chat responses
@@ -45,12 +72,15 @@ class ChatHandler:
         self.context_store = context_store
         self.language = language
         self.system_prompt = system_prompt or self._default_system_prompt()
+        # (interactions version, system + recent Q&A messages) reused until the history changes
+        self._ctx_cache: tuple[int, list[dict[str, str]]] | None = None
+
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=COMMENT_QUEUE_SIZE)
+        self._workers: list[asyncio.Task[None]] = []
 
     def _default_system_prompt(self) -> str:
         """Default system prompt for chat interactions based on language."""
-        with open("chat.prompt") as f:
-            template = f.read()
-        return template.replace("{language}", self.language)
+        return _build_chat_prompt(self.language)
 
     def _build_chat_context(self, user_message: ChatMessage) -> list[dict[str, str]]:
         """
@@ -63,18 +93,24 @@ class ChatHandler:
             List of messages for OpenAI API
 
         """
-        messages = [{"role": "system", "content": self.system_prompt}]
-
-        # Add recent interactions for context (last 3)
-        recent_interactions = self.context_store.get_recent_interactions(count=3)
-        for interaction in recent_interactions:
-            messages.append({"role": "user", "content": interaction.user_message.text})
-            messages.append({"role": "assistant", "content": interaction.ai_response})
+        version = self.context_store.interactions_version()
+        if self._ctx_cache is None or self._ctx_cache[0] != version:
+            prefix = [{"role": "system", "content": self.system_prompt}]
+
+            # Older Q&A that no longer fits the window, condensed
+            rolling_summary = self.context_store.get_rolling_summary()
+            if rolling_summary:
+                prefix.append({"role": "system", "content": f"Earlier Q&A with viewers:\n{rolling_summary}"})
+
+            # Add recent interactions for context (last 3)
+            recent_interactions = self.context_store.get_recent_interactions(count=3)
+            for interaction in recent_interactions:
+                prefix.append({"role": "user", "content": interaction.user_message.text})
+                prefix.append({"role": "assistant", "content": interaction.ai_response})
+            self._ctx_cache = (version, prefix)
 
         # Add current user message
-        messages.append({"role": "user", "content": user_message.text})
-
-        return messages
+        return [*self._ctx_cache[1], {"role": "user", "content": user_message.text}]
 
     async def generate_response(self, user_message: ChatMessage) -> str | None:
         """
@@ -90,16 +126,13 @@ class ChatHandler:
         try:
             messages = self._build_chat_context(user_message)
 
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
+            async with asyncio.timeout(RESPONSE_TIMEOUT_SECONDS):
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                     max_tokens=200,
                     temperature=0.7,
-                ),
-            )
+                )
 
             response_text = response.choices[0].message.content.strip()
             logger.info("Generated chat response: %s", response_text[:100])
@@ -107,11 +140,59 @@ class ChatHandler:
 
             return response_text
 
-        except Exception as e:
+        except (APIError, TimeoutError) as e:
             logger.exception("Error generating chat response: %s", e)
             return None
 
-    async def process_comment(self, comment: dict[str, Any]) -> str | None:
+    def start_workers(self, on_response: Callable[[str], Awaitable[None]], n: int = CHAT_WORKERS) -> None:
+        """
+        Start the worker tasks that answer queued comments.
+
+        Args:
+            on_response: Coroutine function called with each generated response
+            n: Number of workers, i.e. the maximum number of concurrent OpenAI calls
+
+        """
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker(on_response), name=f"chat_worker_{i}") for i in range(n)]
+
+    async def stop_workers(self) -> None:
+        """Cancel the worker tasks and wait for them to finish."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self, on_response: Callable[[str], Awaitable[None]]) -> None:
+        while True:
+            comment = await self._queue.get()
+            try:
+                response = await self._handle(comment)
+                if response:
+                    await on_response(response)
+            except Exception as e:
+                logger.exception("Error processing comment: %s", e)
+            finally:
+                self._queue.task_done()
+
+    async def process_comment(self, comment: dict[str, Any]) -> None:
+        """
+        Queue a YouTube comment for the chat workers.
+
+        Waits up to COMMENT_QUEUE_PUT_TIMEOUT seconds for room in the queue and
+        drops the comment if the backlog does not drain in time.
+
+        Args:
+            comment: Comment dict with 'text', 'author', 'timestamp'
+
+        """
+        try:
+            await asyncio.wait_for(self._queue.put(comment), timeout=COMMENT_QUEUE_PUT_TIMEOUT)
+        except TimeoutError:
+            logger.warning("Chat queue full, dropping comment from %s", comment.get("author", "Unknown"))
+
+    async def _handle(self, comment: dict[str, Any]) -> str | None:
         """
         Process a YouTube comment and generate a response.
 
@@ -127,6 +208,9 @@ class ChatHandler:
 
         if not text:
             return None
+        if len(text) > MAX_COMMENT_CHARS:
+            logger.debug("Truncating %d-char comment from %s", len(text), author)
+            text = text[:MAX_COMMENT_CHARS]
 
         # Add to context store
         chat_message = ChatMessage(
@@ -24,6 +24,9 @@ AVATARTALK_PROMPT_PATH = os.getenv("AVATARTALK_PROMPT_PATH")
 AVATARTALK_MODEL = os.getenv("AVATARTALK_MODEL", "gpt-4o-mini")
 AVATARTALK_TOPICS_FILE = os.getenv("AVATARTALK_TOPICS_FILE", "topics.txt")
 
+# Chat comments longer than this are truncated before they enter the context
+MAX_COMMENT_CHARS = 500
+
 # GeneFace
 GENEFACE_URL = os.getenv("GENEFACE_URL")
 
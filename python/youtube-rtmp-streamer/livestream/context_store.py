@@ -8,10 +8,20 @@ from collections import deque
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
+from livestream.config import MAX_COMMENT_CHARS
+
 logger = logging.getLogger(__name__)
 
+# How much of each history get_context_summary includes
+SUMMARY_CHAT_MESSAGES = 10
+SUMMARY_INTERACTIONS = 5
+_CHAT_HEADER = "=== Recent Chat Messages ==="
+_QA_HEADER = "=== Recent Q&A Interactions ==="
+# Interactions evicted from the window are folded into a rolling summary of this size
+MAX_ROLLING_SUMMARY_CHARS = 1000
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatMessage:
     """Represents a chat message in the global context."""
 
@@ -20,7 +30,7 @@ class ChatMessage:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatInteraction:
     """Represents a user question and AI response pair."""
 
@@ -50,12 +60,19 @@ class GlobalContextStore:
             max_interactions: Maximum number of Q&A interactions to keep
 
         """
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._chat_messages: deque[ChatMessage] = deque(maxlen=max_chat_messages)
         self._interactions: deque[ChatInteraction] = deque(maxlen=max_interactions)
+        # Summary lines are formatted once on insert instead of on every narration tick
+        self._chat_lines: deque[str] = deque(maxlen=SUMMARY_CHAT_MESSAGES)
+        self._qa_lines: deque[str] = deque(maxlen=SUMMARY_INTERACTIONS)
+        self._rolling_summary = ""
+        # Bumped whenever the interactions change so readers can cache derived data
+        self._version = 0
 
     def add_chat_message(self, author: str, text: str) -> None:
         """Add a new chat message to the store."""
+        text = text[:MAX_COMMENT_CHARS]
         with self._lock:
             message = ChatMessage(
                 author=author,
@@ -63,6 +80,7 @@ class GlobalContextStore:
                 timestamp=datetime.now(UTC),
             )
             self._chat_messages.append(message)
+            self._chat_lines.append(f"{author}: {text}")
             logger.debug("Added chat message from %s: %s", author, text[:50])
 
     def add_interaction(self, user_message: ChatMessage, ai_response: str) -> None:
@@ -73,7 +91,11 @@ class GlobalContextStore:
                 ai_response=ai_response,
                 timestamp=datetime.now(UTC),
             )
+            if len(self._interactions) == self._interactions.maxlen:
+                self._fold_into_summary(self._interactions.popleft())
             self._interactions.append(interaction)
+            self._qa_lines.append(f"Q ({user_message.author}): {user_message.text}\nA: {ai_response}\n")
+            self._version += 1
             logger.debug("Added interaction: Q: %s, A: %s", user_message.text[:50], ai_response[:50])
 
     def get_recent_chat_messages(self, count: int | None = None) -> list[ChatMessage]:
@@ -87,11 +109,11 @@ class GlobalContextStore:
             List of recent chat messages, oldest first
 
         """
-        with self._lock:
-            messages = list(self._chat_messages)
-            if count is not None:
-                messages = messages[-count:]
-            return messages
+        # list(deque) snapshots atomically, so pure reads don't need the lock
+        messages = list(self._chat_messages)
+        if count is not None:
+            messages = messages[-count:]
+        return messages
 
     def get_recent_interactions(self, count: int | None = None) -> list[ChatInteraction]:
         """
@@ -104,11 +126,25 @@ class GlobalContextStore:
             List of recent interactions, oldest first
 
         """
-        with self._lock:
-            interactions = list(self._interactions)
-            if count is not None:
-                interactions = interactions[-count:]
-            return interactions
+        interactions = list(self._interactions)
+        if count is not None:
+            interactions = interactions[-count:]
+        return interactions
+
+    def _fold_into_summary(self, interaction: ChatInteraction) -> None:
+        """Keep the gist of an evicted interaction; the oldest text is dropped first."""
+        question = interaction.user_message
+        entry = f"{question.author} asked: {question.text} / A: {interaction.ai_response}"
+        summary = f"{self._rolling_summary}\n{entry}" if self._rolling_summary else entry
+        self._rolling_summary = summary[-MAX_ROLLING_SUMMARY_CHARS:]
+
+    def get_rolling_summary(self) -> str:
+        """Condensed history of interactions that have fallen out of the window."""
+        return self._rolling_summary
+
+    def interactions_version(self) -> int:
+        """Return a counter that changes whenever the stored interactions change."""
+        return self._version
 
     def get_context_summary(self) -> str:
         """
@@ -120,23 +156,10 @@ class GlobalContextStore:
         """
         with self._lock:
             lines = []
-
-            # Add recent chat messages
-            recent_messages = list(self._chat_messages)[-10:]
-            if recent_messages:
-                lines.append("=== Recent Chat Messages ===")
-                for msg in recent_messages:
-                    lines.append(f"{msg.author}: {msg.text}")
-                lines.append("")
-
-            # Add recent Q&A interactions
-            recent_qa = list(self._interactions)[-5:]
-            if recent_qa:
-                lines.append("=== Recent Q&A Interactions ===")
-                for interaction in recent_qa:
-                    lines.append(f"Q ({interaction.user_message.author}): {interaction.user_message.text}")
-                    lines.append(f"A: {interaction.ai_response}")
-                    lines.append("")
+            if self._chat_lines:
+                lines += [_CHAT_HEADER, *self._chat_lines, ""]
+            if self._qa_lines:
+                lines += [_QA_HEADER, *self._qa_lines]
 
             return "\n".join(lines) if lines else "No recent context available."
 
@@ -145,4 +168,8 @@ class GlobalContextStore:
         with self._lock:
             self._chat_messages.clear()
             self._interactions.clear()
+            self._chat_lines.clear()
+            self._qa_lines.clear()
+            self._rolling_summary = ""
+            self._version += 1
             logger.info("Context store cleared")
@@ -10,7 +10,8 @@ from collections import deque
 from datetime import UTC, datetime
 from functools import partial
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 from livestream.avatartalk import AvatarTalkConnector
 from livestream.chat_handler import ChatHandler
@@ -88,6 +89,8 @@ class AvatarTalkStreamer:
 
         logger.debug("Initializing OpenAI client...")
         self.client = self._init_openai_client()
+        # Chat replies await the async client directly instead of holding an executor thread
+        self.async_client = self._init_async_openai_client()
         logger.debug("OpenAI client initialized")
 
         self.model = AVATARTALK_MODEL
@@ -110,6 +113,7 @@ class AvatarTalkStreamer:
         # Global context store - shared between chat and narration
         logger.debug("Initializing global context store...")
         self.context_store = GlobalContextStore(max_chat_messages=50, max_interactions=10)
+        self._chat_post_lock = asyncio.Lock()
 
         # Rolling context for avatar narration - keep last 2 segments only
         # Using deque with maxlen to prevent unbounded growth
@@ -144,7 +148,7 @@ class AvatarTalkStreamer:
         # Chat handler for direct Q&A - uses same teacher persona as narration
         logger.debug("Initializing chat handler...")
         self.chat_handler = ChatHandler(
-            self.client,
+            self.async_client,
             self.model,
             self.context_store,
             language=language_full,
@@ -169,8 +173,6 @@ class AvatarTalkStreamer:
 
     def _init_openai_client(self) -> OpenAI:
         """Initialize OpenAI client with connection pool limits to prevent memory leaks."""
-        import httpx
-
         # Configure httpx client with connection limits to prevent unbounded growth
         # This is critical when running multiple instances and making frequent API calls
         http_client = httpx.Client(
@@ -183,6 +185,18 @@ class AvatarTalkStreamer:
         )
         return OpenAI(http_client=http_client)
 
+    def _init_async_openai_client(self) -> AsyncOpenAI:
+        """Initialize async OpenAI client with the same connection pool limits."""
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        return AsyncOpenAI(http_client=http_client)
+
     async def close(self) -> None:
         """Clean up resources (OpenAI client, YouTube manager, AvatarTalk connector)."""
         logger.info("Closing AvatarTalkStreamer resources...")
@@ -195,6 +209,13 @@ class AvatarTalkStreamer:
         except Exception as e:
             logger.error("Error closing OpenAI client: %s", e)
 
+        try:
+            if hasattr(self, "async_client") and self.async_client:
+                await self.async_client.close()
+                logger.debug("Async OpenAI client closed")
+        except Exception as e:
+            logger.exception("Error closing async OpenAI client: %s", e)
+
         # Close YouTube manager
         try:
             if hasattr(self, "youtube_manager") and self.youtube_manager:
@@ -417,25 +438,9 @@ class AvatarTalkStreamer:
                 wait_time = max(youtube_poll_seconds, BUSY_WAIT_SECONDS)
                 logger.info(f"Polling interval: {wait_time:.2f}s")
 
-                # Process each comment
+                # Hand each comment to the chat workers (see _run_chat)
                 for comment in comments:
-                    try:
-                        response = await self.chat_handler.process_comment(comment)
-
-                        if response:
-                            logger.info("Sending chat response: %s", response[:100])
-                            try:
-                                await asyncio.wait_for(
-                                    loop.run_in_executor(None, self.youtube_manager.send_chat_message, response),
-                                    timeout=10.0,
-                                )
-                                logger.debug("Chat response sent successfully")
-                            except TimeoutError:
-                                logger.warning("Chat loop: send_chat_message() timed out after 10s")
-                            except Exception as e:
-                                logger.exception("Failed to send chat message: %s", e)
-                    except Exception as e:
-                        logger.exception("Error processing comment: %s", e)
+                    await self.chat_handler.process_comment(comment)
 
             except KeyboardInterrupt:
                 logger.info("Chat loop interrupted by user")
@@ -449,6 +454,34 @@ class AvatarTalkStreamer:
 
         logger.info("Chat loop stopped")
 
+    async def _run_chat(self) -> None:
+        """Run the chat loop with its pool of response workers."""
+        # Comments are answered by a fixed pool of workers; the loop only enqueues them
+        self.chat_handler.start_workers(self._send_chat_response)
+        try:
+            await self._chat_loop()
+        finally:
+            await self.chat_handler.stop_workers()
+
+    async def _send_chat_response(self, response: str) -> None:
+        """Post a generated chat response to the YouTube live chat."""
+        logger.info("Sending chat response: %s", response[:100])
+        loop = asyncio.get_running_loop()
+        # Workers generate replies concurrently, but posting is serialized: the
+        # YouTube client is not thread-safe and replies are sent in paced chunks
+        async with self._chat_post_lock:
+            future = loop.run_in_executor(None, self.youtube_manager.send_chat_message, response)
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=10.0)
+                logger.debug("Chat response sent successfully")
+            except TimeoutError:
+                logger.warning("Chat loop: send_chat_message() timed out after 10s")
+                # Keep holding the lock until the executor thread is done with the client
+                with contextlib.suppress(Exception):
+                    await future
+            except Exception as e:
+                logger.exception("Failed to send chat message: %s", e)
+
     async def _narration_loop(self) -> None:
         """
         Avatar narration loop.
@@ -672,7 +705,7 @@ class AvatarTalkStreamer:
             logger.info("Starting concurrent task loops...")
             try:
                 async with asyncio.TaskGroup() as tg:
-                    tg.create_task(self._chat_loop(), name="chat_loop")
+                    tg.create_task(self._run_chat(), name="chat_loop")
                     tg.create_task(self._narration_loop(), name="narration_loop")
                     tg.create_task(self._healthcheck_loop(), name="healthcheck_loop")
                     logger.info("Created tasks: chat_loop, narration_loop, healthcheck_loop")